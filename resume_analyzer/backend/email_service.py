@@ -4,7 +4,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Optional
 from dotenv import load_dotenv
-from ..ingestion.helpers import connect_postgres, load_env_vars
+from ..ingestion.helpers import pooled_connection
 import datetime
 from datetime import datetime, timedelta  # Add this line
 from dateutil import parser
@@ -27,19 +27,17 @@ class EmailService:
     def get_email_template(self, template_name: str) -> Optional[Dict[str, str]]:
         """Fetch email template from database using your existing table structure."""
         try:
-            env = load_env_vars()
-            conn = connect_postgres(env)
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT subject_template, body_template 
-                FROM public.email_templates 
-                WHERE template_name = %s;
-            """, (template_name,))
-            
-            result = cur.fetchone()
-            cur.close()
-            conn.close()
+            with pooled_connection(autocommit=True) as conn:
+                cur = conn.cursor()
+                
+                cur.execute("""
+                    SELECT subject_template, body_template 
+                    FROM public.email_templates 
+                    WHERE template_name = %s;
+                """, (template_name,))
+                
+                result = cur.fetchone()
+                cur.close()
             
             if result:
                 return {
@@ -55,21 +53,19 @@ class EmailService:
     def get_candidate_info(self, candidate_key: str) -> Optional[Dict]:
         """Fetch candidate information for email templating."""
         try:
-            env = load_env_vars()
-            conn = connect_postgres(env)
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT candidate_key, email, university, applied_position, 
-                       salary, part_or_full, from_date, to_date
-                FROM public.resumes_metadata 
-                WHERE candidate_key = %s 
-                LIMIT 1;
-            """, (candidate_key,))
-            
-            result = cur.fetchone()
-            cur.close()
-            conn.close()
+            with pooled_connection(autocommit=True) as conn:
+                cur = conn.cursor()
+                
+                cur.execute("""
+                    SELECT candidate_key, email, university, applied_position, 
+                           salary, part_or_full, from_date, to_date
+                    FROM public.resumes_metadata 
+                    WHERE candidate_key = %s 
+                    LIMIT 1;
+                """, (candidate_key,))
+                
+                result = cur.fetchone()
+                cur.close()
             
             if result:
                 return {
@@ -4,26 +4,26 @@ import torch
 import torch.nn.functional as F
 from .model import Qwen2VLClient
 from dotenv import load_dotenv
-from ..ingestion.helpers import load_env_vars, connect_postgres
+from ..ingestion.helpers import pooled_connection
 from ..ingestion.helpers import embed_sentences
 
+# Rows fetched per round-trip when streaming all candidate keys
+CANDIDATE_KEYS_ITERSIZE = 10000
 
 def fetch_candidate_keys(matched: List[str]) -> Dict[str, str]:
     """
     Given a list of filenames from resumes_metadata, fetch their candidate_key
     values from Postgres and return a dict mapping filename -> candidate_key.
     """
-    env = load_env_vars()
-    conn = connect_postgres(env)
-    cur = conn.cursor()
-    # Use ANY to match any filename in the list
-    cur.execute(
-        "SELECT filename, candidate_key FROM public.resumes_metadata WHERE filename = ANY(%s);",
-        (matched,),
-    )
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        # Use ANY to match any filename in the list
+        cur.execute(
+            "SELECT filename, candidate_key FROM public.resumes_metadata WHERE filename = ANY(%s);",
+            (matched,),
+        )
+        rows = cur.fetchall()
+        cur.close()
 
     # Build and return the mapping
     return {filename: candidate_key for filename, candidate_key in rows}
@@ -52,20 +52,18 @@ def find_matching_resumes_by_candidates(
     input_norm = F.normalize(input_vecs, dim=1)               # (K, D)
 
     # 2) Fetch only the rows for these candidate_keys
-    env  = load_env_vars()
-    conn = connect_postgres(env)
-    cur  = conn.cursor()
-    cur.execute(
-        """
-        SELECT filename, skills_txt, skills_embed
-          FROM public.resumes_normal
-         WHERE candidate_key = ANY(%s);
-        """,
-        (candidate_keys,)
-    )
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        cur  = conn.cursor()
+        cur.execute(
+            """
+            SELECT filename, skills_txt, skills_embed
+              FROM public.resumes_normal
+             WHERE candidate_key = ANY(%s);
+            """,
+            (candidate_keys,)
+        )
+        rows = cur.fetchall()
+        cur.close()
 
     matches: Dict[str, List[Tuple[str, str, float]]] = {}
     for filename, skills_txt, emb_json in rows:
@@ -104,13 +102,12 @@ def _get_all_candidate_keys() -> List[str]:
     """
     Get all available candidate keys from the database
     """
-    env = load_env_vars()
-    conn = connect_postgres(env)
-    cur = conn.cursor()
-    cur.execute("SELECT DISTINCT candidate_key FROM public.resumes_metadata;")
-    keys = [row[0] for row in cur.fetchall()]
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        # Server-side cursor: keys stream in batches instead of one client-side result set
+        with conn.cursor(name="all_candidate_keys") as cur:
+            cur.itersize = CANDIDATE_KEYS_ITERSIZE
+            cur.execute("SELECT DISTINCT candidate_key FROM public.resumes_metadata;")
+            keys = [row[0] for row in cur]
     return keys
 
     
@@ -133,20 +130,18 @@ def _handle_resume_details_query(user_query: str, candidate_key: str) -> Dict[st
         }
     
     # Get resume data for the single candidate
-    env = load_env_vars()
-    conn = connect_postgres(env)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT filename, candidate_key, skills_summary_txt, full_resume_txt
-        FROM public.resumes_normal
-        WHERE candidate_key = %s AND skills_summary_txt IS NOT NULL;
-        """,
-        (candidate_key,)
-    )
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT filename, candidate_key, skills_summary_txt, full_resume_txt
+            FROM public.resumes_normal
+            WHERE candidate_key = %s AND skills_summary_txt IS NOT NULL;
+            """,
+            (candidate_key,)
+        )
+        row = cur.fetchone()
+        cur.close()
     
     if not row:
         return {
@@ -374,20 +369,18 @@ def _get_initial_judgments(candidate_keys: List[str], input_skills: List[str]) -
     """
     Phase 1: Get reasoning and transferability assessment for each candidate
     """
-    env = load_env_vars()
-    conn = connect_postgres(env)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT filename, candidate_key, skills_summary_txt
-        FROM public.resumes_normal
-        WHERE candidate_key = ANY(%s) AND skills_summary_txt IS NOT NULL;
-        """,
-        (candidate_keys,)
-    )
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT filename, candidate_key, skills_summary_txt
+            FROM public.resumes_normal
+            WHERE candidate_key = ANY(%s) AND skills_summary_txt IS NOT NULL;
+            """,
+            (candidate_keys,)
+        )
+        rows = cur.fetchall()
+        cur.close()
 
     results = {}
     
@@ -692,22 +685,20 @@ def _handle_skill_matching_query(user_query: str, candidate_keys: List[str], con
 
     # NEW: Create filename to candidate_key mapping
     filename_to_candidate = {}
-    env = load_env_vars()
-    conn = connect_postgres(env)
-    cur = conn.cursor()
-    
-    # Get candidate names for the analyzed files
-    analyzed_filenames = [item[0] for item in sorted_results]
-    if analyzed_filenames:
-        cur.execute("""
-            SELECT filename, candidate_key 
-            FROM public.resumes_normal 
-            WHERE filename = ANY(%s)
-        """, (analyzed_filenames,))
-        filename_to_candidate = dict(cur.fetchall())
-    
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn:
+        cur = conn.cursor()
+
+        # Get candidate names for the analyzed files
+        analyzed_filenames = [item[0] for item in sorted_results]
+        if analyzed_filenames:
+            cur.execute("""
+                SELECT filename, candidate_key 
+                FROM public.resumes_normal 
+                WHERE filename = ANY(%s)
+            """, (analyzed_filenames,))
+            filename_to_candidate = dict(cur.fetchall())
+
+        cur.close()
 
     answer_parts = [f"Based on your query about {', '.join(skills)}, here are the candidates ranked by suitability:\n"]
         
@@ -950,6 +941,7 @@ if __name__ == "__main__":
 def detect_email_intent(user_input: str, candidate_keys: List[str]) -> Dict[str, any]:
     """
     Use LLM to detect if user wants to send an email and extract details including specific fields.
+    When the reply can't be parsed the result is a non-request with 'detection_failed': True.
     """
     candidates_list = ", ".join(candidate_keys)
     
@@ -1213,7 +1205,7 @@ def detect_email_intent(user_input: str, candidate_keys: List[str]) -> Dict[str,
         required_fields = ["is_email_request", "template_type", "candidate_key", "extracted_fields"]
         if not all(field in email_intent for field in required_fields):
             print(f"Invalid email intent response: {email_intent}")
-            return {'is_email_request': False}
+            return {'is_email_request': False, 'detection_failed': True}
         
         # Additional validation - ensure candidate exists if specified
         if email_intent['is_email_request'] and email_intent['candidate_key']:
@@ -1240,4 +1232,4 @@ def detect_email_intent(user_input: str, candidate_keys: List[str]) -> Dict[str,
         print("----------------------------------------------------")
         print(f"Error detecting email intent: {e}")
         print("----------------------------------------------------")
-        return {'is_email_request': False}
\ No newline at end of file
+        return {'is_email_request': False, 'detection_failed': True}
\ No newline at end of file
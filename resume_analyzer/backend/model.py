@@ -1,6 +1,7 @@
 import os
 import requests
 import json
+import threading
 from typing import List, Dict, Optional, Union
 
 class Qwen2VLClient:
@@ -29,6 +30,17 @@ class Qwen2VLClient:
         self.model = model
         self.temperature = temperature
         self.timeout = timeout
+        # Keep-alive sessions so repeated calls reuse the HTTP connection; one per
+        # thread, since a cached client is shared by every Streamlit session
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's keep-alive requests.Session (requests.Session isn't thread-safe)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
 
     def _build_payload(
         self,
@@ -155,7 +167,7 @@ class Qwen2VLClient:
 
         # 1) Send the request
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint,
                 headers={"Content-Type": "application/json"},
                 data=json.dumps(body),
@@ -1,154 +1,187 @@
-import psycopg2
+from psycopg2.extras import Json, RealDictCursor
 from datetime import datetime
 from typing import Optional, Dict, Any
-import json
+
+from ..ingestion.helpers import execute_prepared, load_env_vars, pooled_connection
+
+# Streamlit reruns poll the same session many times a second; the UI's poll
+# (check_active_sessions in ingest_ui) serves repeats from its cache for this window.
+PROGRESS_CACHE_TTL = 0.5
+
+# Only the most recent errors are kept in `state`, so the JSONB stays small
+MAX_TRACKED_ERRORS = 20
+
+# Transient per-file state (last file, recent errors, error count) lives in the
+# `state` JSONB column so updates touch one column instead of rewriting the
+# current_file/errors text columns. Those legacy columns are only read as a
+# fallback for sessions written before `state` existed.
+_PROGRESS_COLUMNS = """
+    session_id, status, total_files, processed_files,
+    COALESCE(state->>'last_file', current_file) AS current_file,
+    started_at, updated_at,
+    COALESCE(metadata, '{}'::jsonb) AS metadata,
+    COALESCE(state->'errors', to_jsonb(errors), '[]'::jsonb) AS errors,
+    COALESCE((state->>'error_count')::int, cardinality(errors), 0) AS error_count
+"""
+
+# Hot statements, PREPAREd lazily on each pooled connection and then EXECUTEd
+# so the server skips parse/plan on every progress update.
+_PREPARED_STATEMENTS = {
+    "pt_start_ingestion": """
+        INSERT INTO ingestion_progress
+        (session_id, status, total_files, processed_files, started_at, updated_at, metadata, state)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, '{}'::jsonb)
+        ON CONFLICT (session_id) DO UPDATE SET
+            status = EXCLUDED.status,
+            total_files = EXCLUDED.total_files,
+            processed_files = EXCLUDED.processed_files,
+            started_at = EXCLUDED.started_at,
+            updated_at = EXCLUDED.updated_at,
+            metadata = EXCLUDED.metadata,
+            state = EXCLUDED.state,
+            current_file = NULL,
+            errors = '{}'
+    """,
+    "pt_get_progress": f"""
+        SELECT {_PROGRESS_COLUMNS}
+        FROM ingestion_progress
+        WHERE session_id = $1
+    """,
+    "pt_active_sessions": f"""
+        SELECT {_PROGRESS_COLUMNS}
+        FROM ingestion_progress
+        WHERE status = 'RUNNING'
+        ORDER BY started_at DESC
+    """,
+    # Skip no-op writes when the same file is reported twice
+    "pt_update_progress": """
+        UPDATE ingestion_progress
+        SET processed_files = $1,
+            state = state || jsonb_build_object('last_file', $2::text),
+            updated_at = $3
+        WHERE session_id = $4
+          AND (processed_files IS DISTINCT FROM $1 OR state->>'last_file' IS DISTINCT FROM $2::text)
+    """,
+    "pt_update_progress_error": f"""
+        UPDATE ingestion_progress
+        SET processed_files = $1,
+            state = state || jsonb_build_object(
+                'last_file', $2::text,
+                'error_count', COALESCE((state->>'error_count')::int, 0) + 1,
+                'errors', (
+                    SELECT jsonb_agg(e ORDER BY i)
+                    FROM jsonb_array_elements(COALESCE(state->'errors', '[]'::jsonb) || to_jsonb($4::text))
+                         WITH ORDINALITY AS t(e, i)
+                    WHERE i > jsonb_array_length(COALESCE(state->'errors', '[]'::jsonb)) + 1 - {MAX_TRACKED_ERRORS}
+                )
+            ),
+            updated_at = $3
+        WHERE session_id = $5
+    """,
+    "pt_finish_ingestion": """
+        UPDATE ingestion_progress
+        SET status = $1, updated_at = $2
+        WHERE session_id = $3
+    """,
+}
 
 class ProgressTracker:
-    def __init__(self, conn):
-        self.conn = conn
+    # Databases whose table/index DDL already ran in this process
+    _ensured: set = set()
+
+    def __init__(self, env: Optional[Dict[str, str]] = None):
+        self.env = env or load_env_vars()
         self.ensure_table_exists()
-    
+
+    @staticmethod
+    def _execute_prepared(cur, name: str, params: tuple = ()):
+        """EXECUTE a named statement, preparing it first on connections that lack it"""
+        # Safe to retry inside: callers run in autocommit, so no transaction is aborted
+        execute_prepared(cur, name, _PREPARED_STATEMENTS[name], params)
+
+    def _exec(self, name: str, params: tuple = ()):
+        """Run a single prepared statement on a pooled autocommit connection"""
+        with pooled_connection(self.env, autocommit=True) as conn:
+            with conn.cursor() as cur:
+                self._execute_prepared(cur, name, params)
+
+    def _fetch(self, name: str, params: tuple = (), one: bool = False):
+        """Run a prepared read query on a pooled autocommit connection; rows come back as dicts"""
+        with pooled_connection(self.env, autocommit=True) as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                self._execute_prepared(cur, name, params)
+                return cur.fetchone() if one else cur.fetchall()
+
     def ensure_table_exists(self):
-        """Create progress tracking table if it doesn't exist"""
-        cur = self.conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS ingestion_progress (
-                id SERIAL PRIMARY KEY,
-                session_id VARCHAR(255) UNIQUE,
-                status VARCHAR(50),
-                total_files INTEGER,
-                processed_files INTEGER,
-                current_file VARCHAR(255),
-                started_at TIMESTAMP,
-                updated_at TIMESTAMP,
-                metadata JSONB,
-                errors TEXT[]
-            )
-        """)
-        self.conn.commit()
-        cur.close()
-    
+        """Create progress tracking table if it doesn't exist (once per process and database)"""
+        key = (self.env["PG_HOST"], self.env["PG_PORT"], self.env["PG_DB"])
+        if key in ProgressTracker._ensured:
+            return
+
+        with pooled_connection(self.env) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS ingestion_progress (
+                        id SERIAL PRIMARY KEY,
+                        session_id VARCHAR(255) UNIQUE,
+                        status VARCHAR(50),
+                        total_files INTEGER,
+                        processed_files INTEGER,
+                        current_file VARCHAR(255),
+                        started_at TIMESTAMP,
+                        updated_at TIMESTAMP,
+                        metadata JSONB,
+                        errors TEXT[]
+                    )
+                """)
+                cur.execute("""
+                    ALTER TABLE ingestion_progress
+                    ADD COLUMN IF NOT EXISTS state JSONB NOT NULL DEFAULT '{}'::jsonb
+                """)
+                # Active sessions are polled on every UI refresh; index only the RUNNING rows
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_ingestion_running
+                    ON ingestion_progress (started_at DESC)
+                    WHERE status = 'RUNNING'
+                """)
+
+        ProgressTracker._ensured.add(key)
+
     # Update the start_ingestion method:
 
     def start_ingestion(self, session_id: str, total_files: int, metadata: Dict[str, Any] = None):
         """Start tracking a new ingestion session"""
-        cur = self.conn.cursor()
-        cur.execute("""
-            INSERT INTO ingestion_progress 
-            (session_id, status, total_files, processed_files, current_file, started_at, updated_at, metadata, errors)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (session_id) DO UPDATE SET
-                status = EXCLUDED.status,
-                total_files = EXCLUDED.total_files,
-                processed_files = EXCLUDED.processed_files,
-                started_at = EXCLUDED.started_at,
-                updated_at = EXCLUDED.updated_at,
-                metadata = EXCLUDED.metadata,
-                errors = EXCLUDED.errors
-        """, (
-            session_id, 
-            "RUNNING", 
-            total_files, 
-            0, 
-            None, 
-            datetime.now(), 
-            datetime.now(), 
-            json.dumps(metadata) if metadata else json.dumps({}),  # Always convert to JSON string
-            []
+        self._exec("pt_start_ingestion", (
+            session_id,
+            "RUNNING",
+            total_files,
+            0,
+            datetime.now(),
+            datetime.now(),
+            Json(metadata or {})
         ))
-        self.conn.commit()
-        cur.close()
 
     # And update the get_progress method:
     def get_progress(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get current progress for a session"""
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT session_id, status, total_files, processed_files, current_file, 
-                started_at, updated_at, metadata, errors
-            FROM ingestion_progress 
-            WHERE session_id = %s
-        """, (session_id,))
-        
-        row = cur.fetchone()
-        cur.close()
-        
-        if row:
-            return {
-                "session_id": row[0],
-                "status": row[1],
-                "total_files": row[2],
-                "processed_files": row[3],
-                "current_file": row[4],
-                "started_at": row[5],
-                "updated_at": row[6],
-                "metadata": json.loads(row[7]) if row[7] and isinstance(row[7], str) else (row[7] if row[7] else {}),
-                "errors": row[8] or []
-            }
-        return None
+        row = self._fetch("pt_get_progress", (session_id,), one=True)
+        return dict(row) if row else None
 
     # And update get_all_active_sessions:
     def get_all_active_sessions(self):
         """Get all active ingestion sessions"""
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT session_id, status, total_files, processed_files, current_file, 
-                started_at, updated_at, metadata, errors
-            FROM ingestion_progress 
-            WHERE status = 'RUNNING'
-            ORDER BY started_at DESC
-        """)
-        
-        rows = cur.fetchall()
-        cur.close()
-        
-        sessions = []
-        for row in rows:
-            sessions.append({
-                "session_id": row[0],
-                "status": row[1],
-                "total_files": row[2],
-                "processed_files": row[3],
-                "current_file": row[4],
-                "started_at": row[5],
-                "updated_at": row[6],
-                "metadata": json.loads(row[7]) if row[7] and isinstance(row[7], str) else (row[7] if row[7] else {}),
-                "errors": row[8] or []
-            })
-        
-        return sessions
-    
+        rows = self._fetch("pt_active_sessions")
+        return [dict(row) for row in rows]
+
     def update_progress(self, session_id: str, processed_files: int, current_file: str = None, error: str = None):
         """Update progress for a session"""
-        cur = self.conn.cursor()
-        
         if error:
-            cur.execute("""
-                UPDATE ingestion_progress 
-                SET processed_files = %s, current_file = %s, updated_at = %s, errors = array_append(errors, %s)
-                WHERE session_id = %s
-            """, (processed_files, current_file, datetime.now(), error, session_id))
+            self._exec("pt_update_progress_error",
+                       (processed_files, current_file, datetime.now(), error, session_id))
         else:
-            cur.execute("""
-                UPDATE ingestion_progress 
-                SET processed_files = %s, current_file = %s, updated_at = %s
-                WHERE session_id = %s
-            """, (processed_files, current_file, datetime.now(), session_id))
-        
-        self.conn.commit()
-        cur.close()
-    
+            self._exec("pt_update_progress",
+                       (processed_files, current_file, datetime.now(), session_id))
+
     def finish_ingestion(self, session_id: str, status: str = "COMPLETED"):
         """Mark ingestion as finished"""
-        cur = self.conn.cursor()
-        cur.execute("""
-            UPDATE ingestion_progress 
-            SET status = %s, updated_at = %s
-            WHERE session_id = %s
-        """, (status, datetime.now(), session_id))
-        self.conn.commit()
-        cur.close()
-    
-    
-    
-    
\ No newline at end of file
+        self._exec("pt_finish_ingestion", (status, datetime.now(), session_id))
@@ -1,9 +1,10 @@
-from dateutil import parser
+from datetime import datetime
 
-d1 = parser.parse("June")
-d2 = parser.parse("Aug 2026")
+if __name__ == "__main__":
+    d1 = datetime.strptime("June", "%B").replace(year=datetime.now().year)
+    d2 = datetime.strptime("Aug 2026", "%b %Y")
 
-delta = d2 - d1
-print(delta.days)
-print(d1.year, d1.month, d1.day)
-print(d2.year, d2.month, d2.day)
+    delta = d2 - d1
+    print(delta.days)
+    print(d1.year, d1.month, d1.day)
+    print(d2.year, d2.month, d2.day)
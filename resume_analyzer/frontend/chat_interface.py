@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import sys
+from collections import deque
 from dotenv import load_dotenv
 
 
@@ -19,6 +20,18 @@ from resume_analyzer.ingestion.helpers import (
 )
 from resume_analyzer.backend.model import Qwen2VLClient
 load_dotenv()  # In case helpers need environment variables
+
+CHAT_HISTORY_LIMIT = 50
+
+
+@st.cache_resource
+def get_qwen_client() -> Qwen2VLClient:
+    """Build the chat LLM client once per process instead of on every rerun."""
+    return Qwen2VLClient(
+        host="http://localhost", port=8001,
+        model="Qwen/Qwen2.5-VL-7B-Instruct",
+        temperature=0.7
+    )
 # ──────────────────────────────────────────────────────────────────────────────
 # CHAT INTERFACE MODE
 # ──────────────────────────────────────────────────────────────────────────────
@@ -31,16 +44,23 @@ if selected_files:
     for fn in selected_files:
         st.markdown(f"- **{fn}**")
 
-    # init your LLM client (reuse the same one you built for ingest)
-    qwen_client = Qwen2VLClient(
-        host="http://localhost", port=8001,
-        model="Qwen/Qwen2.5-VL-7B-Instruct",
-        temperature=0.7
-    )
+    # init your LLM client (one per process, reused across reruns)
+    qwen_client = get_qwen_client()
 
-    # initialize chat history
+    # prepare a system prompt explaining the context, once per set of files
+    files_key = tuple(selected_files)
+    if st.session_state.get("system_prompt_files") != files_key:
+        st.session_state.system_prompt_files = files_key
+        st.session_state.system_prompt = f"""
+        You are an expert HR assistant.  I have the following resumes:
+        {', '.join(selected_files)}
+
+        Answer user questions by referring only to those resumes.  If you don't know, say so.
+        """
+
+    # initialize chat history (bounded, so each rerun renders at most CHAT_HISTORY_LIMIT messages)
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []  # list of {"role":"user"/"assistant", "content":...}
+        st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)  # {"role":"user"/"assistant", "content":...}
 
     # render the existing messages
     for msg in st.session_state.chat_history:
@@ -53,18 +73,10 @@ if selected_files:
         st.session_state.chat_history.append({"role": "user", "content": user_prompt})
         st.chat_message("user").write(user_prompt)
 
-        # prepare a system prompt explaining the context
-        system_prompt = f"""
-        You are an expert HR assistant.  I have the following resumes:
-        {', '.join(selected_files)}
-
-        Answer user questions by referring only to those resumes.  If you don't know, say so.
-        """
-
         # call Qwen (or any chat LLM you prefer)
         assistant_reply = qwen_client.chat_completion(
             question=user_prompt,
-            system_prompt=system_prompt
+            system_prompt=st.session_state.system_prompt
         ).strip()
 
         # add and display assistant reply
@@ -3,6 +3,40 @@ from typing import Dict, List, Optional, Tuple
 from ..backend.email_service import EmailService
 from ..backend.helpers import detect_email_intent, fetch_candidate_keys
 
+# VERY STRICT: Only accept these exact phrases for confirmation
+CONFIRMATION_PHRASES = frozenset({'send', 'yes', 'confirm', 'ok', 'proceed', 'y'})
+CANCEL_PHRASES = frozenset({'cancel', 'no', 'stop', 'abort', 'n'})
+
+# Reruns and re-submits repeat the same LLM intent call; keep the TTL short
+# since the prompt may contain relative dates ("tomorrow", "next week").
+EMAIL_INTENT_CACHE_TTL = 60
+
+
+class _EmailIntentFailed(Exception):
+    """Raised out of the intent cache so a failed detection isn't memoized."""
+    def __init__(self, intent: Dict):
+        super().__init__("email intent detection failed")
+        self.intent = intent
+
+
+@st.cache_data(ttl=EMAIL_INTENT_CACHE_TTL, show_spinner=False)
+def _cached_email_intent_or_raise(user_input: str, cache_key: Tuple[str, ...], _candidate_keys: List[str]) -> Dict:
+    # Keyed on the sorted candidates; the leading underscore keeps the
+    # original order out of the hash while the LLM still sees it
+    intent = detect_email_intent(user_input, _candidate_keys)
+    # st.cache_data doesn't cache exceptions, so the next attempt asks again
+    if intent.get('detection_failed'):
+        raise _EmailIntentFailed(intent)
+    return intent
+
+
+def _cached_email_intent(user_input: str, candidate_keys: List[str]) -> Dict:
+    """detect_email_intent memoized on the query and the candidate set; failures aren't cached."""
+    try:
+        return _cached_email_intent_or_raise(user_input, tuple(sorted(candidate_keys)), list(candidate_keys))
+    except _EmailIntentFailed as e:
+        return e.intent
+
 def handle_email_confirmation(user_input: str, email_service: EmailService) -> Tuple[Optional[str], bool]:
     """
     Handle email confirmation responses.
@@ -15,12 +49,8 @@ def handle_email_confirmation(user_input: str, email_service: EmailService) -> T
     
     user_response = user_input.lower().strip()
     
-    # VERY STRICT: Only accept these exact phrases for confirmation
-    confirmation_phrases = ['send', 'yes', 'confirm', 'ok', 'proceed', 'y']
-    cancel_phrases = ['cancel', 'no', 'stop', 'abort', 'n']
-    
-    is_confirmation = user_response in confirmation_phrases
-    is_cancellation = user_response in cancel_phrases
+    is_confirmation = user_response in CONFIRMATION_PHRASES
+    is_cancellation = user_response in CANCEL_PHRASES
     
     if is_confirmation:
         return _send_pending_email(email_service), True
@@ -62,15 +92,15 @@ def _generate_pending_email_reminder(user_input: str) -> str:
     """Generate reminder message for pending email."""
     pending = st.session_state.pending_email
     
-    reply = f"⚠️ **Please respond to the pending email first!**\n\n"
-    reply += f"There is an email to **{pending['candidate_key']}** waiting for your confirmation.\n\n"
-    reply += "Please reply with:\n"
-    reply += "• **'send'**, **'yes'**, **'confirm'**, **'ok'**, **'proceed'** to send the email\n"
-    reply += "• **'cancel'**, **'no'**, **'stop'**, **'abort'** to cancel the email\n\n"
-    reply += f"Your response '{user_input}' was not recognized as a clear confirmation or cancellation.\n"
-    reply += "I cannot process other requests until you decide on this email."
-    
-    return reply
+    return (
+        "⚠️ **Please respond to the pending email first!**\n\n"
+        f"There is an email to **{pending['candidate_key']}** waiting for your confirmation.\n\n"
+        "Please reply with:\n"
+        "• **'send'**, **'yes'**, **'confirm'**, **'ok'**, **'proceed'** to send the email\n"
+        "• **'cancel'**, **'no'**, **'stop'**, **'abort'** to cancel the email\n\n"
+        f"Your response '{user_input}' was not recognized as a clear confirmation or cancellation.\n"
+        "I cannot process other requests until you decide on this email."
+    )
 
 # def handle_email_request(user_input: str, matched_files: List[str], email_service: EmailService) -> Optional[str]:
 #     """
@@ -104,7 +134,7 @@ def handle_email_request(user_input: str, matched_files: List[str], email_servic
     print(f"📧 Available candidates: {current_candidate_keys}")
     print("----------------------------------------------------")
     
-    email_intent = detect_email_intent(user_input, current_candidate_keys)
+    email_intent = _cached_email_intent(user_input, current_candidate_keys)
     
     print("----------------------------------------------------")
     print(f"📧 Email intent detected: {email_intent}")
@@ -1,10 +1,88 @@
+import concurrent.futures
+import io
+import os
+import re
+import threading
 import time
-import psycopg2
-from ..ingestion.helpers import connect_postgres, load_env_vars
+from ..ingestion.helpers import execute_prepared, pooled_connection, refresh_overview_view
 from typing import Dict, List, Tuple, Optional
 import streamlit as st
-from .helpers import connect_postgres, load_env_vars
+import numpy as np
 import pandas as pd
+from psycopg2.extras import execute_values
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Dashboard reads are cached across reruns; writes in this module clear them
+OVERVIEW_CACHE_TTL = 300
+CANDIDATE_SEARCH_CACHE_TTL = 60
+# The deletion tab lists at most this many matches for a search
+CANDIDATE_SEARCH_LIMIT = 50
+# Skill categories only change from the skills tab and job-description import
+SKILL_CATEGORIES_CACHE_TTL = 600
+# Scanned job-description pages are OCR'd concurrently, one tesseract process each
+OCR_MAX_WORKERS = os.cpu_count() or 1
+# Encoded CSV downloads kept per score table before the oldest are dropped
+SCORE_EXPORT_CACHE_SIZE = 16
+# The cached score table is shared by every session's script thread
+_SCORE_EXPORT_LOCK = threading.Lock()
+# Pages with less extracted text than this are treated as scans and OCR'd
+OCR_MIN_PAGE_CHARS = 20
+OCR_DPI = 300
+
+# Deletion-tab reads run on every keystroke and candidate pick; they are
+# PREPAREd once per pooled connection and EXECUTEd after that.
+_PREPARED_STATEMENTS = {
+    # Both branches are served by the lower(candidate_key) text_pattern_ops
+    # indexes; UNION ALL + GROUP BY dedups once, in a single hash aggregate
+    "fh_candidate_search": """
+        SELECT candidate_key
+        FROM (
+            SELECT candidate_key FROM public.resumes_metadata
+            WHERE lower(candidate_key) LIKE $1
+            UNION ALL
+            SELECT candidate_key FROM public.resumes_normal
+            WHERE lower(candidate_key) LIKE $1
+        ) AS matches
+        GROUP BY candidate_key
+        ORDER BY candidate_key
+        LIMIT $2
+    """,
+    # Candidates in either table, counted live so the deletion tab sees
+    # keys that only have a skills row or were ingested moments ago
+    "fh_candidate_count": """
+        SELECT COUNT(*)
+        FROM (
+            SELECT candidate_key FROM public.resumes_metadata
+            UNION
+            SELECT candidate_key FROM public.resumes_normal
+        ) AS keys
+    """,
+    # Metadata and skills rows in one round-trip, tagged by source table.
+    # Values come back ready to display: blanks as N/A, skills as a
+    # preview of the first five.
+    "fh_candidate_details": """
+        SELECT 'm' AS src, filename,
+               COALESCE(NULLIF(university, ''), 'N/A'),
+               COALESCE(NULLIF(applied_position, ''), 'N/A'),
+               COALESCE(NULLIF(salary, ''), 'N/A'),
+               COALESCE(NULLIF(part_or_full, ''), 'N/A'),
+               COALESCE(NULLIF(citizenship, ''), 'N/A'),
+               NULL::text AS skills
+        FROM public.resumes_metadata
+        WHERE candidate_key = $1
+        UNION ALL
+        SELECT 'n', filename, NULL, NULL, NULL, NULL, NULL,
+               CASE
+                   WHEN cardinality(skills_categories) > 0 THEN
+                       array_to_string(skills_categories[1:5], ', ')
+                       || CASE WHEN cardinality(skills_categories) > 5 THEN '...' ELSE '' END
+                   ELSE 'N/A'
+               END
+        FROM public.resumes_normal
+        WHERE candidate_key = $1
+    """,
+}
 
 def get_database_overview() -> Optional[Dict]:
     """
@@ -14,226 +92,66 @@ def get_database_overview() -> Optional[Dict]:
         Dictionary containing database statistics or None if error occurs
     """
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
+        return _fetch_database_overview()
+    except Exception as e:
+        st.error(f"Error fetching database overview: {e}")
+        return None
+
+def clear_overview_caches(refresh_view: bool = True) -> None:
+    """
+    Recompute the overview view and drop cached dashboard reads after the resume tables change.
+    Pass refresh_view=False when the writer (e.g. the ingestion worker) already refreshed it.
+    """
+    if refresh_view:
+        try:
+            refresh_overview_view()
+        except Exception as e:
+            print(f"⚠️ Failed to refresh overview view: {e}")
+    _fetch_database_overview.clear()
+    _fetch_candidate_search.clear()
+    _fetch_candidate_details.clear()
+    _fetch_score_table.clear()
+
+@st.cache_data(ttl=OVERVIEW_CACHE_TTL, show_spinner=False)
+def _fetch_database_overview() -> Dict:
+    """Read the precomputed statistics row; cached so reruns don't hit Postgres."""
+    with pooled_connection(autocommit=True) as conn:
         cur = conn.cursor()
-        
-        # Get total records
-        cur.execute("SELECT COUNT(*) FROM public.resumes_metadata;")
-        total_metadata = cur.fetchone()[0]
-        
-        cur.execute("SELECT COUNT(*) FROM public.resumes_normal;")
-        total_normal = cur.fetchone()[0]
-        
-        # Get unique candidates
-        cur.execute("SELECT COUNT(DISTINCT candidate_key) FROM public.resumes_metadata;")
-        unique_candidates = cur.fetchone()[0]
-        
-        
-        # Get skills distribution
-        cur.execute("""
-            SELECT unnest(skills_categories) as skill, COUNT(*) as count
-            FROM public.resumes_normal 
-            WHERE skills_categories IS NOT NULL 
-            GROUP BY skill 
-            ORDER BY count DESC 
-            LIMIT 10;
-        """)
-        top_skills = cur.fetchall()
-        
-        # Get university distribution
-        cur.execute("""
-            SELECT university, COUNT(*) as count
-            FROM public.resumes_metadata 
-            WHERE university IS NOT NULL 
-            GROUP BY university 
-            ORDER BY count DESC 
-            LIMIT 5;
-        """)
-        top_universities = cur.fetchall()
-        
-        # Get employment type distribution
-        cur.execute("""
-            SELECT part_or_full, COUNT(*) as count
-            FROM public.resumes_metadata 
-            WHERE part_or_full IS NOT NULL 
-            GROUP BY part_or_full 
-            ORDER BY count DESC;
-        """)
-        employment_distribution = cur.fetchall()
-        
-        # Get citizenship distribution
-        cur.execute("""
-            SELECT citizenship, COUNT(*) as count
-            FROM public.resumes_metadata 
-            WHERE citizenship IS NOT NULL 
-            GROUP BY citizenship 
-            ORDER BY count DESC;
-        """)
-        citizenship_distribution = cur.fetchall()
-        
-        # Get salary distribution
+
+        # resumes_overview_mv holds every statistic in one row; each
+        # distribution is a JSON array of [label, count] pairs.
         cur.execute("""
-            SELECT 
-                CASE 
-                    WHEN salary = 'any' THEN 'Flexible'
-                    WHEN salary ~ '^[0-9]+$' THEN
-                        CASE 
-                            WHEN CAST(salary AS INTEGER) < 1000 THEN '< $1000'
-                            WHEN CAST(salary AS INTEGER) < 1200 THEN '$1000-1200'
-                            WHEN CAST(salary AS INTEGER) < 1400 THEN '$1200-1400'
-                            WHEN CAST(salary AS INTEGER) < 1600 THEN '$1400-1600'
-                            ELSE '$1600+'
-                        END
-                    ELSE 'Other'
-                END as salary_range,
-                COUNT(*) as count
-            FROM public.resumes_metadata 
-            WHERE salary IS NOT NULL 
-            GROUP BY salary_range 
-            ORDER BY count DESC;
+            SELECT total_metadata, total_normal, unique_candidates,
+                   top_skills, top_universities, employment_distribution,
+                   citizenship_distribution, salary_distribution
+            FROM public.resumes_overview_mv;
         """)
-        salary_distribution = cur.fetchall()
-        
+        (
+            total_metadata,
+            total_normal,
+            unique_candidates,
+            top_skills,
+            top_universities,
+            employment_distribution,
+            citizenship_distribution,
+            salary_distribution,
+        ) = cur.fetchone()
+
         cur.close()
-        conn.close()
-        
-        return {
-            'total_metadata': total_metadata,
-            'total_normal': total_normal,
-            'unique_candidates': unique_candidates,
-            'top_skills': top_skills,
-            'top_universities': top_universities,
-            'employment_distribution': employment_distribution,
-            'citizenship_distribution': citizenship_distribution,
-            'salary_distribution': salary_distribution
-        }
-        
-    except Exception as e:
-        st.error(f"Error fetching database overview: {e}")
-        return None
 
-# def render_overview_dashboard() -> None:
-#     """
-#     Render the complete overview dashboard in Streamlit.
-#     This is a comprehensive view of the entire database.
-#     """
-#     st.markdown("### 📊 Database Overview Dashboard")
-#     st.caption("Comprehensive view of your resume database statistics and insights")
-    
-#     # Fetch database stats
-#     db_overview = get_database_overview()
-    
-#     if not db_overview:
-#         st.error("❌ Unable to fetch database overview")
-#         return
-    
-#     # === TOP METRICS ROW ===
-#     col1, col2, col3, col4 = st.columns(4)
-#     with col1:
-#         st.metric("📄 Total Resumes", db_overview['total_metadata'])
-#     with col2:
-#         st.metric("🔍 Processed Resumes", db_overview['total_normal'])
-#     with col3:
-#         st.metric("👥 Unique Candidates", db_overview['unique_candidates'])
-#     with col4:
-#         sync_rate = f"{(db_overview['total_normal']/max(db_overview['total_metadata'], 1)*100):.1f}%"
-#         st.metric("🔄 Sync Rate", sync_rate)
-    
-#     st.markdown("---")
-    
-#     # === DISTRIBUTIONS AND ANALYTICS ===
-#     tab1, tab2 = st.tabs(["📊 Demographics", "🛠️ Skills & Experience"])
-    
-#     with tab1:
-#         col1, col2 = st.columns(2)
-        
-#         with col1:
-#             st.markdown("#### 🎓 University Distribution")
-#             if db_overview['top_universities']:
-#                 uni_data = {
-#                     "University": [row[0] for row in db_overview['top_universities']],
-#                     "Count": [row[1] for row in db_overview['top_universities']]
-#                 }
-#                 st.dataframe(uni_data, hide_index=True, use_container_width=True)
-#             else:
-#                 st.info("No university data available")
-            
-#             st.markdown("#### 🌍 Citizenship Distribution")
-#             if db_overview['citizenship_distribution']:
-#                 citizen_data = {
-#                     "Citizenship": [row[0] for row in db_overview['citizenship_distribution']],
-#                     "Count": [row[1] for row in db_overview['citizenship_distribution']]
-#                 }
-#                 st.dataframe(citizen_data, hide_index=True, use_container_width=True)
-                
-#                 # Show as pie chart
-#                 st.bar_chart(dict(db_overview['citizenship_distribution']))
-#             else:
-#                 st.info("No citizenship data available")
-        
-#         with col2:
-#             st.markdown("#### 👔 Employment Type Distribution")
-#             if db_overview['employment_distribution']:
-#                 emp_data = {
-#                     "Type": [row[0] for row in db_overview['employment_distribution']],
-#                     "Count": [row[1] for row in db_overview['employment_distribution']]
-#                 }
-#                 st.dataframe(emp_data, hide_index=True, use_container_width=True)
-                
-#                 # Show as bar chart
-#                 st.bar_chart(dict(db_overview['employment_distribution']))
-#             else:
-#                 st.info("No employment type data available")
-            
-#             st.markdown("#### 💰 Salary Distribution")
-#             if db_overview['salary_distribution']:
-#                 salary_data = {
-#                     "Range": [row[0] for row in db_overview['salary_distribution']],
-#                     "Count": [row[1] for row in db_overview['salary_distribution']]
-#                 }
-#                 st.dataframe(salary_data, hide_index=True, use_container_width=True)
-#             else:
-#                 st.info("No salary data available")
-    
-#     with tab2:
-#         col1, col2 = st.columns([2, 1])
-        
-#         with col1:
-#             st.markdown("#### 🛠️ Top Skills")
-#             if db_overview['top_skills']:
-#                 skills_data = {
-#                     "Skill": [row[0] for row in db_overview['top_skills']],
-#                     "Candidates": [row[1] for row in db_overview['top_skills']]
-#                 }
-#                 st.dataframe(skills_data, hide_index=True, use_container_width=True, height=400)
-                
-#                 # Show as horizontal bar chart
-#                 skills_dict = {row[0]: row[1] for row in db_overview['top_skills']}
-#                 st.bar_chart(skills_dict)
-#             else:
-#                 st.info("No skills data available")
-        
-#         with col2:
-#             st.markdown("#### 📈 Quick Stats")
-            
-#             # Additional calculated metrics
-#             if db_overview['total_metadata'] > 0:
-#                 avg_resumes_per_candidate = db_overview['total_metadata'] / db_overview['unique_candidates']
-#                 st.metric("📊 Avg Resumes/Candidate", f"{avg_resumes_per_candidate:.1f}")
-            
-#             if db_overview['top_skills']:
-#                 total_skill_mentions = sum(row[1] for row in db_overview['top_skills'])
-#                 st.metric("🎯 Top 10 Skills Total", total_skill_mentions)
-                
-#                 most_popular_skill = db_overview['top_skills'][0]
-#                 st.metric("🥇 Most Popular Skill", f"{most_popular_skill[0]} ({most_popular_skill[1]})")
-            
-#             # Data quality indicators
-#             processing_completeness = f"{sync_rate}"
-#             st.metric("✅ Processing Complete", processing_completeness)
-    
-    
+    # Distributions are built into DataFrames here, once per cache fill, and
+    # the dashboard hands the same frame to both st.dataframe and st.bar_chart
+    return {
+        'total_metadata': total_metadata,
+        'total_normal': total_normal,
+        'unique_candidates': unique_candidates,
+        'top_skills': pd.DataFrame(top_skills, columns=["Skill", "Candidates"]),
+        'top_universities': pd.DataFrame(top_universities, columns=["University", "Count"]),
+        'employment_distribution': pd.DataFrame(employment_distribution, columns=["Type", "Count"]),
+        'citizenship_distribution': pd.DataFrame(citizenship_distribution, columns=["Citizenship", "Count"]),
+        'salary_distribution': pd.DataFrame(salary_distribution, columns=["Range", "Count"])
+    }
+
 def render_overview_dashboard() -> None:
     """
     Render the complete overview dashboard in Streamlit.
@@ -242,6 +160,20 @@ def render_overview_dashboard() -> None:
     st.markdown("### 📊 Database Overview Dashboard")
     st.caption("Comprehensive view of your resume database statistics and insights")
     
+    _render_overview_body()
+    
+    st.markdown("---")
+        
+@st.fragment
+def _render_overview_body() -> None:
+    """
+    Metrics and tabs of the overview dashboard. Runs as a fragment so the refresh
+    button and widgets in these tabs rerun only this part of the page.
+    """
+    # Stats are cached; only re-query Postgres when asked to
+    if st.button("🔄 Refresh Overview", key="refresh_overview_btn"):
+        clear_overview_caches()
+    
     # Fetch database stats
     db_overview = get_database_overview()
     
@@ -271,49 +203,37 @@ def render_overview_dashboard() -> None:
         
         with col1:
             st.markdown("#### 🎓 University Distribution")
-            if db_overview['top_universities']:
-                uni_data = {
-                    "University": [row[0] for row in db_overview['top_universities']],
-                    "Count": [row[1] for row in db_overview['top_universities']]
-                }
-                st.dataframe(uni_data, hide_index=True, use_container_width=True)
+            uni_df = db_overview['top_universities']
+            if not uni_df.empty:
+                st.dataframe(uni_df, hide_index=True, use_container_width=True)
             else:
                 st.info("No university data available")
             
             st.markdown("#### 🌍 Citizenship Distribution")
-            if db_overview['citizenship_distribution']:
-                citizen_data = {
-                    "Citizenship": [row[0] for row in db_overview['citizenship_distribution']],
-                    "Count": [row[1] for row in db_overview['citizenship_distribution']]
-                }
-                st.dataframe(citizen_data, hide_index=True, use_container_width=True)
+            citizen_df = db_overview['citizenship_distribution']
+            if not citizen_df.empty:
+                st.dataframe(citizen_df, hide_index=True, use_container_width=True)
                 
                 # Show as pie chart
-                st.bar_chart(dict(db_overview['citizenship_distribution']))
+                st.bar_chart(citizen_df, x="Citizenship", y="Count")
             else:
                 st.info("No citizenship data available")
         
         with col2:
             st.markdown("#### 👔 Employment Type Distribution")
-            if db_overview['employment_distribution']:
-                emp_data = {
-                    "Type": [row[0] for row in db_overview['employment_distribution']],
-                    "Count": [row[1] for row in db_overview['employment_distribution']]
-                }
-                st.dataframe(emp_data, hide_index=True, use_container_width=True)
+            emp_df = db_overview['employment_distribution']
+            if not emp_df.empty:
+                st.dataframe(emp_df, hide_index=True, use_container_width=True)
                 
                 # Show as bar chart
-                st.bar_chart(dict(db_overview['employment_distribution']))
+                st.bar_chart(emp_df, x="Type", y="Count")
             else:
                 st.info("No employment type data available")
             
             st.markdown("#### 💰 Salary Distribution")
-            if db_overview['salary_distribution']:
-                salary_data = {
-                    "Range": [row[0] for row in db_overview['salary_distribution']],
-                    "Count": [row[1] for row in db_overview['salary_distribution']]
-                }
-                st.dataframe(salary_data, hide_index=True, use_container_width=True)
+            salary_df = db_overview['salary_distribution']
+            if not salary_df.empty:
+                st.dataframe(salary_df, hide_index=True, use_container_width=True)
             else:
                 st.info("No salary data available")
     
@@ -322,16 +242,12 @@ def render_overview_dashboard() -> None:
         
         with col1:
             st.markdown("#### 🛠️ Top Skills")
-            if db_overview['top_skills']:
-                skills_data = {
-                    "Skill": [row[0] for row in db_overview['top_skills']],
-                    "Candidates": [row[1] for row in db_overview['top_skills']]
-                }
-                st.dataframe(skills_data, hide_index=True, use_container_width=True, height=400)
+            skills_df = db_overview['top_skills']
+            if not skills_df.empty:
+                st.dataframe(skills_df, hide_index=True, use_container_width=True, height=400)
                 
                 # Show as horizontal bar chart
-                skills_dict = {row[0]: row[1] for row in db_overview['top_skills']}
-                st.bar_chart(skills_dict)
+                st.bar_chart(skills_df, x="Skill", y="Candidates")
             else:
                 st.info("No skills data available")
         
@@ -343,12 +259,12 @@ def render_overview_dashboard() -> None:
                 avg_resumes_per_candidate = db_overview['total_metadata'] / db_overview['unique_candidates']
                 st.metric("📊 Avg Resumes/Candidate", f"{avg_resumes_per_candidate:.1f}")
             
-            if db_overview['top_skills']:
-                total_skill_mentions = sum(row[1] for row in db_overview['top_skills'])
+            if not skills_df.empty:
+                total_skill_mentions = int(skills_df["Candidates"].sum())
                 st.metric("🎯 Top 10 Skills Total", total_skill_mentions)
                 
-                most_popular_skill = db_overview['top_skills'][0]
-                st.metric("🥇 Most Popular Skill", f"{most_popular_skill[0]} ({most_popular_skill[1]})")
+                most_popular_skill, most_popular_count = skills_df.iloc[0]
+                st.metric("🥇 Most Popular Skill", f"{most_popular_skill} ({most_popular_count})")
             
             # Data quality indicators
             processing_completeness = f"{sync_rate}"
@@ -357,37 +273,30 @@ def render_overview_dashboard() -> None:
     with tab3:
         # NEW CHAT INTERFACE FOR ALL CANDIDATES
         render_overview_chat_interface()
-    
-    st.markdown("---")
         
 def render_overview_chat_interface():
     """
     Render a chat interface for talking to all candidates in the database.
     """
-    print("💬" * 30)
-    print("render_overview_chat_interface() CALLED!")
-    print("💬" * 30)
-    
     st.markdown("#### 💬 Chat with All Candidates")
     st.caption("Ask questions about any candidate or send emails directly from here")
     
     # Get all candidate keys and filenames from database
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
-        
-        # Get all candidates and their files
-        cur.execute("""
-            SELECT DISTINCT rm.filename, rm.candidate_key
-            FROM public.resumes_metadata rm
-            WHERE rm.candidate_key IS NOT NULL
-            ORDER BY rm.candidate_key, rm.filename;
-        """)
-        all_records = cur.fetchall()
-        
-        cur.close()
-        conn.close()
+        with pooled_connection(autocommit=True) as conn:
+            cur = conn.cursor()
+
+            # Get all candidates and their files; filename is the primary key,
+            # so the pairs are already unique without a DISTINCT
+            cur.execute("""
+                SELECT rm.filename, rm.candidate_key
+                FROM public.resumes_metadata rm
+                WHERE rm.candidate_key IS NOT NULL
+                ORDER BY rm.candidate_key, rm.filename;
+            """)
+            all_records = cur.fetchall()
+
+            cur.close()
         
         if not all_records:
             st.info("📭 No candidates found in the database.")
@@ -395,7 +304,8 @@ def render_overview_chat_interface():
         
         # Extract all filenames and candidate keys
         all_filenames = [record[0] for record in all_records]
-        all_candidate_keys = list(set([record[1] for record in all_records]))
+        # Rows arrive ordered by candidate_key, so this dedup keeps them sorted
+        all_candidate_keys = list(dict.fromkeys(record[1] for record in all_records))
         
         print(f"💬 Found {len(all_candidate_keys)} candidates with {len(all_filenames)} total files")
         
@@ -404,7 +314,7 @@ def render_overview_chat_interface():
         st.info(
             f"💬 Ready to chat about **{len(all_candidate_keys)} candidates** "
             f"with **{len(all_filenames)} total files**\n\n"
-            f"**Candidate Keys:** {', '.join(sorted(all_candidate_keys))}"
+            f"**Candidate Keys:** {', '.join(all_candidate_keys)}"
         )
         
         # Initialize session state - use a unique key for overview chat
@@ -501,67 +411,69 @@ def get_quick_stats() -> Optional[Dict[str, int]]:
         Dictionary with basic statistics or None if error occurs
     """
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
-        
-        cur.execute("SELECT COUNT(*) FROM public.resumes_metadata;")
-        total_metadata = cur.fetchone()[0]
-        
-        cur.execute("SELECT COUNT(*) FROM public.resumes_normal;")
-        total_normal = cur.fetchone()[0]
-        
-        cur.execute("SELECT COUNT(DISTINCT candidate_key) FROM public.resumes_metadata;")
-        unique_candidates = cur.fetchone()[0]
-        
-        cur.close()
-        conn.close()
-        
-        return {
-            'total_metadata': total_metadata,
-            'total_normal': total_normal,
-            'unique_candidates': unique_candidates
-        }
-        
+        # Same counts as the dashboard, so reuse its cached result
+        overview = _fetch_database_overview()
     except Exception as e:
         st.error(f"Error fetching quick stats: {e}")
         return None
+
+    return {
+        'total_metadata': overview['total_metadata'],
+        'total_normal': overview['total_normal'],
+        'unique_candidates': overview['unique_candidates']
+    }
+
+def count_candidates() -> int:
+    """
+    Count the distinct candidate keys across both resume tables, uncached.
     
-def get_all_candidate_keys() -> List[str]:
+    Returns:
+        Number of candidates, or 0 if the query fails
+    """
+    try:
+        with pooled_connection(autocommit=True) as conn:
+            cur = conn.cursor()
+            execute_prepared(cur, "fh_candidate_count", _PREPARED_STATEMENTS["fh_candidate_count"])
+            count = cur.fetchone()[0]
+            cur.close()
+        return count
+    except Exception as e:
+        st.error(f"Error counting candidates: {e}")
+        return 0
+
+def search_candidates(prefix: str, limit: int = CANDIDATE_SEARCH_LIMIT) -> List[str]:
     """
-    Get all unique candidate keys from both resumes_metadata and resumes_normal tables.
+    Find candidate keys in either resume table that start with `prefix` (case-insensitive).
     
+    Args:
+        prefix: Leading characters of the candidate key; empty matches everyone
+        limit: Maximum number of keys to return
+        
     Returns:
-        List of unique candidate keys
+        Sorted list of at most `limit` candidate keys
     """
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
+        return _fetch_candidate_search(prefix.strip().lower(), limit)
+    except Exception as e:
+        st.error(f"Error searching candidates: {e}")
+        return []
+
+@st.cache_data(ttl=CANDIDATE_SEARCH_CACHE_TTL, show_spinner=False)
+def _fetch_candidate_search(prefix: str, limit: int) -> List[str]:
+    """Prefix match on lower(candidate_key); cached per prefix so typing doesn't re-query."""
+    # Escape LIKE wildcards so the search text is matched literally
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    with pooled_connection(autocommit=True) as conn:
         cur = conn.cursor()
-        
-        # Get candidate keys from both tables
-        cur.execute("""
-            SELECT DISTINCT candidate_key 
-            FROM (
-                SELECT candidate_key FROM public.resumes_metadata 
-                WHERE candidate_key IS NOT NULL
-                UNION
-                SELECT candidate_key FROM public.resumes_normal 
-                WHERE candidate_key IS NOT NULL
-            ) AS combined_keys
-            ORDER BY candidate_key;
-        """)
-        
+
+        execute_prepared(cur, "fh_candidate_search", _PREPARED_STATEMENTS["fh_candidate_search"], (pattern, limit))
+
         candidate_keys = [row[0] for row in cur.fetchall()]
-        
+
         cur.close()
-        conn.close()
-        
-        return candidate_keys
-        
-    except Exception as e:
-        st.error(f"Error fetching candidate keys: {e}")
-        return []
+
+    return candidate_keys
 
 def get_candidate_details(candidate_key: str) -> Dict:
     """
@@ -574,82 +486,39 @@ def get_candidate_details(candidate_key: str) -> Dict:
         Dictionary with candidate details from both tables
     """
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
-        
-        # Get metadata records
-        cur.execute("""
-            SELECT filename, university, applied_position, salary, part_or_full, citizenship
-            FROM public.resumes_metadata 
-            WHERE candidate_key = %s;
-        """, (candidate_key,))
-        metadata_records = cur.fetchall()
-        
-        # Get normal records
-        cur.execute("""
-            SELECT filename, skills_categories
-            FROM public.resumes_normal 
-            WHERE candidate_key = %s;
-        """, (candidate_key,))
-        normal_records = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        return {
-            'candidate_key': candidate_key,
-            'metadata_records': metadata_records,
-            'normal_records': normal_records,
-            'total_files': len(set([r[0] for r in metadata_records] + [r[0] for r in normal_records]))
-        }
-        
+        return _fetch_candidate_details(candidate_key)
     except Exception as e:
         st.error(f"Error fetching candidate details: {e}")
         return {}
 
-# def delete_candidate_records(candidate_key: str) -> Dict[str, int]:
-#     """
-#     Delete all records for a specific candidate from both tables.
-    
-#     Args:
-#         candidate_key: The candidate identifier to delete
-        
-#     Returns:
-#         Dictionary with deletion counts from both tables
-#     """
-#     try:
-#         env = load_env_vars()
-#         conn = connect_postgres(env)
-#         cur = conn.cursor()
-        
-#         # Delete from resumes_metadata
-#         cur.execute("""
-#             DELETE FROM public.resumes_metadata 
-#             WHERE candidate_key = %s;
-#         """, (candidate_key,))
-#         metadata_deleted = cur.rowcount
-        
-#         # Delete from resumes_normal
-#         cur.execute("""
-#             DELETE FROM public.resumes_normal 
-#             WHERE candidate_key = %s;
-#         """, (candidate_key,))
-#         normal_deleted = cur.rowcount
-        
-#         conn.commit()
-#         cur.close()
-#         conn.close()
-        
-#         return {
-#             'metadata_deleted': metadata_deleted,
-#             'normal_deleted': normal_deleted,
-#             'total_deleted': metadata_deleted + normal_deleted
-#         }
-        
-#     except Exception as e:
-#         st.error(f"Error deleting candidate records: {e}")
-#         return {'metadata_deleted': 0, 'normal_deleted': 0, 'total_deleted': 0}
+@st.cache_data(ttl=OVERVIEW_CACHE_TTL, show_spinner=False)
+def _fetch_candidate_details(candidate_key: str) -> Dict:
+    """Both tables' rows for one candidate; cached per key so preview reruns don't hit Postgres."""
+    with pooled_connection(autocommit=True) as conn:
+        cur = conn.cursor()
+
+        execute_prepared(cur, "fh_candidate_details", _PREPARED_STATEMENTS["fh_candidate_details"], (candidate_key,))
+        rows = cur.fetchall()
+
+        cur.close()
+
+    # Split by source table and collect file names in one pass
+    metadata_records = []
+    normal_records = []
+    filenames = set()
+    for src, filename, *fields, skills in rows:
+        filenames.add(filename)
+        if src == 'm':
+            metadata_records.append((filename, *fields))
+        else:
+            normal_records.append((filename, skills))
+
+    return {
+        'candidate_key': candidate_key,
+        'metadata_records': metadata_records,
+        'normal_records': normal_records,
+        'total_files': len(filenames)
+    }
 
 def delete_candidate_records(candidate_key: str) -> Dict[str, int]:
     """
@@ -660,39 +529,41 @@ def delete_candidate_records(candidate_key: str) -> Dict[str, int]:
         # Import PDF server
         from ..frontend.pdf_server import pdf_server
         
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
+        # A single statement is atomic on its own; autocommit skips the BEGIN/COMMIT round-trips
+        with pooled_connection(autocommit=True) as conn:
+            cur = conn.cursor()
 
-        # Get PDF URLs before deletion
-        cur.execute("""
-            SELECT pdf_url FROM public.resumes_metadata WHERE candidate_key = %s AND pdf_url IS NOT NULL
-            UNION
-            SELECT pdf_url FROM public.resumes_normal WHERE candidate_key = %s AND pdf_url IS NOT NULL
-        """, (candidate_key, candidate_key))
-        
-        pdf_urls = [row[0] for row in cur.fetchall()]
-        
-        # Delete PDF files from server
+            # One atomic statement deletes from all three tables and hands back
+            # the PDF URLs, so the rows and the counts come from one snapshot
+            cur.execute("""
+                WITH m AS (
+                    DELETE FROM public.resumes_metadata WHERE candidate_key = %(key)s RETURNING pdf_url
+                ),
+                n AS (
+                    DELETE FROM public.resumes_normal WHERE candidate_key = %(key)s RETURNING pdf_url
+                ),
+                s AS (
+                    DELETE FROM public.resume_category_score WHERE candidate_key = %(key)s RETURNING 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM m),
+                    (SELECT COUNT(*) FROM n),
+                    (SELECT COUNT(*) FROM s),
+                    ARRAY(
+                        SELECT pdf_url FROM m WHERE pdf_url IS NOT NULL
+                        UNION
+                        SELECT pdf_url FROM n WHERE pdf_url IS NOT NULL
+                    );
+            """, {'key': candidate_key})
+            metadata_deleted, normal_deleted, score_deleted, pdf_urls = cur.fetchone()
+
+            cur.close()
+
+        # Remove the files only once the database delete has committed
         for pdf_url in pdf_urls:
             pdf_server.delete_pdf(pdf_url)
-        
-        # 1) Delete from resumes_metadata
-        cur.execute("DELETE FROM public.resumes_metadata WHERE candidate_key = %s;", (candidate_key,))
-        metadata_deleted = cur.rowcount
-
-        # 2) Delete from resumes_normal
-        cur.execute("DELETE FROM public.resumes_normal WHERE candidate_key = %s;", (candidate_key,))
-        normal_deleted = cur.rowcount
-
-        # 3) Delete from resume_category_score
-        cur.execute("DELETE FROM public.resume_category_score WHERE candidate_key = %s;", (candidate_key,))
-        score_deleted = cur.rowcount
-
-        conn.commit()
-        cur.close()
-        conn.close()
 
+        clear_overview_caches()
         print(f"✅ Deleted candidate {candidate_key} and {len(pdf_urls)} PDF files")
 
         return {
@@ -714,14 +585,13 @@ def render_deletion_tab() -> None:
     st.markdown("### 🗑️ Candidate Record Deletion")
     st.caption("⚠️ **Warning**: This will permanently delete all records for the selected candidate from both tables!")
     
-    # Get all candidate keys
-    candidate_keys = get_all_candidate_keys()
+    candidate_count = count_candidates()
     
-    if not candidate_keys:
+    if not candidate_count:
         st.info("📭 No candidate records found in the database.")
         return
     
-    st.info(f"📊 Found **{len(candidate_keys)}** candidates in the database")
+    st.info(f"📊 Found **{candidate_count}** candidates in the database")
     
     # Create two columns for selection and preview
     col1, col2 = st.columns([1, 2])
@@ -729,6 +599,19 @@ def render_deletion_tab() -> None:
     with col1:
         st.markdown("#### 👤 Select Candidate")
         
+        # Only the matches for the typed prefix are fetched and sent to the browser
+        search_prefix = st.text_input(
+            "Search candidate:",
+            placeholder="Start typing a name...",
+            key="delete_candidate_search"
+        )
+        candidate_keys = search_candidates(search_prefix)
+        
+        if len(candidate_keys) >= CANDIDATE_SEARCH_LIMIT:
+            st.caption(f"Showing the first {CANDIDATE_SEARCH_LIMIT} matches; type more to narrow the list")
+        elif not candidate_keys:
+            st.caption("No candidates match this search")
+        
         # Selectbox for candidate selection
         selected_candidate = st.selectbox(
             "Choose candidate to delete:",
@@ -738,261 +621,135 @@ def render_deletion_tab() -> None:
         )
     
     with col2:
-        if selected_candidate:
-            st.markdown("#### 📋 Candidate Details")
-            
-            # Get detailed information about the selected candidate
-            candidate_details = get_candidate_details(selected_candidate)
-            
-            if candidate_details:
-                # Display summary metrics
-                col_a, col_b, col_c = st.columns(3)
-                with col_a:
-                    st.metric("📁 Total Files", candidate_details['total_files'])
-                with col_b:
-                    st.metric("📊 Metadata Records", len(candidate_details['metadata_records']))
-                with col_c:
-                    st.metric("🔍 Skills Records", len(candidate_details['normal_records']))
-                
-                # Show detailed records
-                if candidate_details['metadata_records']:
-                    st.markdown("##### 📊 Metadata Records")
-                    metadata_df = {
-                        "Filename": [r[0] for r in candidate_details['metadata_records']],
-                        "University": [r[1] or "N/A" for r in candidate_details['metadata_records']],
-                        "Position": [r[2] or "N/A" for r in candidate_details['metadata_records']],
-                        "Salary": [r[3] or "N/A" for r in candidate_details['metadata_records']],
-                        "Employment": [r[4] or "N/A" for r in candidate_details['metadata_records']],
-                        "Citizenship": [r[5] or "N/A" for r in candidate_details['metadata_records']]
-                    }
-                    st.dataframe(metadata_df, hide_index=True, use_container_width=True)
-                
-                if candidate_details['normal_records']:
-                    st.markdown("##### 🛠️ Skills Records")
-                    normal_df = {
-                        "Filename": [r[0] for r in candidate_details['normal_records']],
-                        "Skills": [", ".join(r[1][:5]) + ("..." if len(r[1]) > 5 else "") if r[1] else "N/A" 
-                                 for r in candidate_details['normal_records']]
-                    }
-                    st.dataframe(normal_df, hide_index=True, use_container_width=True)
-                
-                st.markdown("---")
-                
-                # Deletion section with confirmation
-                st.markdown("##### ⚠️ Danger Zone")
-                
-                # Two-step confirmation process
-                confirm_checkbox = st.checkbox(
-                    f"I understand that deleting **{selected_candidate}** will permanently remove all their records",
-                    key=f"confirm_{selected_candidate}"
-                )
-                
-                if confirm_checkbox:
-                    st.error("🚨 **Final Warning**: This action cannot be undone!")
-                    
-                    delete_button = st.button(
-                        f"🗑️ DELETE {selected_candidate}",
-                        type="primary",
-                        use_container_width=True,
-                        key=f"delete_{selected_candidate}"
-                    )
-                    
-                    if delete_button:
-                        with st.spinner(f"🗑️ Deleting all records for {selected_candidate}..."):
-                            deletion_result = delete_candidate_records(selected_candidate)
-                        
-                        if deletion_result['total_deleted'] > 0:
-                            st.success(
-                                f"✅ **Successfully deleted {selected_candidate}!**\n\n"
-                                f"📊 Metadata records deleted: {deletion_result['metadata_deleted']}\n\n"
-                                f"🔍 Skills records deleted: {deletion_result['normal_deleted']}\n\n"
-                                f"🏷️ Category‐score rows deleted: {deletion_result['score_deleted']}\n\n"
-                                f"📁 Total records deleted: {deletion_result['total_deleted']}"
-                            )
-                            
-                            # Clear the selection by rerunning
-                            st.rerun()
-                        else:
-                            st.error("❌ No records were deleted. Please check if the candidate exists.")
-            
-            else:
-                st.error("❌ Could not retrieve candidate details.")
-        else:
-            st.info("👆 Select a candidate from the left to view their details")
+        _render_candidate_detail(selected_candidate)
     
     # Add refresh button
     st.markdown("---")
     col_refresh1, col_refresh2, col_refresh3 = st.columns([1, 1, 1])
     with col_refresh2:
+        # The click itself reruns the script; only the cached data needs dropping
         if st.button("🔄 Refresh Candidate List", use_container_width=True):
-            st.rerun()
-            
-# def render_skills_management_tab() -> None:
-#     """
-#     Render the skills management tab for viewing and managing skills categories.
-#     """
-#     st.markdown("### 🛠️ Manage Skill Categories")
-#     conn = connect_postgres(load_env_vars())
-#     cur  = conn.cursor()
-
-#     # 1) Show existing categories
-#     st.write("#### Existing Categories")
-#     cur.execute("SELECT id, name FROM skill_category ORDER BY name;")
-#     rows = cur.fetchall()
-#     if rows:
-#         st.table({
-#             "ID":   [r[0] for r in rows],
-#             "Name": [r[1].title() for r in rows],
-#         })
-        
-#         # Show count
-#         st.info(f"📊 Total categories: **{len(rows)}**")
-#     else:
-#         st.info("No skill categories defined yet.")
-
-#     st.markdown("---")
-
-#     # 2) Show previous alert once
-#     if st.session_state.get("cat_success"):
-#         st.success(st.session_state["cat_success"])
-#         del st.session_state["cat_success"]
-
-#     # 3) Clear the text_input on the one run after adding
-#     if st.session_state.get("cat_added", False):
-#         default_new_cat = ""
-#         del st.session_state["cat_added"]
-#     else:
-#         default_new_cat = st.session_state.get("new_cat_input", "")
-
-#     # 4) Add a new category with existence check
-#     st.markdown("#### ➕ Add New Category")
-#     new_cat = st.text_input(
-#         "Add a new category",
-#         placeholder="e.g. Web Development",
-#         key="new_cat_input",
-#         value=default_new_cat,
-#     )
-#     if st.button("➕ Add Category", key="add_cat_btn"):
-#         cat = new_cat.strip()
-#         if not cat:
-#             st.error("Name cannot be empty.")
-#         else:
-#             # Try to insert, returning the name if inserted
-#             cur.execute("""
-#                 INSERT INTO skill_category(name)
-#                 VALUES (LOWER(%s))
-#                 ON CONFLICT(name) DO NOTHING
-#                 RETURNING name;
-#             """, (cat,))
-#             result = cur.fetchone()
-#             if result:
-#                 # insertion happened
-#                 conn.commit()
-#                 st.session_state["cat_success"] = f"Added category: **{cat}**"
-#                 st.session_state["cat_added"]   = True
-#             else:
-#                 # already existed
-#                 st.session_state["cat_success"] = f"Category **{cat}** already exists."
-#             st.rerun()
-
-#     st.markdown("---")
-
-#     # 5) Show previous delete alert once
-#     if st.session_state.get("del_success"):
-#         st.warning(st.session_state["del_success"])
-#         del st.session_state["del_success"]
-
-#     # 6) Delete an existing category
-#     if rows:  # Only show if there are categories to delete
-#         st.markdown("#### 🗑️ Delete Individual Category")
-#         to_delete = st.selectbox(
-#             "Delete a category",
-#             [r[1].title() for r in rows],
-#             index=0 if rows else None
-#         )
-#         if st.button("🗑️ Delete Category", key="del_cat_btn"):
-#             cur.execute(
-#                 "DELETE FROM skill_category WHERE LOWER(name) = LOWER(%s);",
-#                 (to_delete,)
-#             )
-#             conn.commit()
-#             st.session_state["del_success"] = f"Deleted category: **{to_delete}**"
-#             st.rerun()
-
-#     st.markdown("---")
-
-#     # 7) NEW: Delete All Categories section
-#     st.markdown("#### 🧹 Bulk Delete All Categories")
-#     st.warning("⚠️ This will permanently delete **all** skill categories. Use this before ingesting a new job description.")
-    
-#     # Show delete all success message
-#     if st.session_state.get("delete_all_cats_success", False):
-#         st.success("✅ All skill categories have been deleted.")
-#         del st.session_state["delete_all_cats_success"]
-
-#     # Handle confirmation checkbox
-#     if st.session_state.get("deleted_all_cats_once", False):
-#         default_confirm_all = False
-#         del st.session_state["deleted_all_cats_once"]
-#     else:
-#         default_confirm_all = st.session_state.get("confirm_delete_all_cats", False)
-
-#     confirm_delete_all = st.checkbox(
-#         "I understand this will delete all skill categories and cannot be undone",
-#         value=default_confirm_all,
-#         key="confirm_delete_all_cats",
-#     )
-
-#     if st.button("🗑️ DELETE ALL CATEGORIES", key="delete_all_cats_btn", type="secondary"):
-#         if not confirm_delete_all:
-#             st.error("You must check the confirmation box above to delete all categories.")
-#         else:
-#             try:
-#                 # Count categories before deletion
-#                 cur.execute("SELECT COUNT(*) FROM skill_category;")
-#                 count_before = cur.fetchone()[0]
-                
-#                 # Delete all categories
-#                 cur.execute("TRUNCATE TABLE skill_category RESTART IDENTITY CASCADE;")
-#                 conn.commit()
-                
-#                 # Set success flags
-#                 st.session_state["delete_all_cats_success"] = True
-#                 st.session_state["deleted_all_cats_once"] = True
-                
-#                 st.rerun()
-                
-#             except Exception as e:
-#                 st.error(f"❌ Failed to delete all categories: {e}")
+            clear_overview_caches()
+
+@st.fragment
+def _render_candidate_detail(selected_candidate: str) -> None:
+    """
+    Preview and delete controls for one candidate. Runs as a fragment so the
+    confirmation checkbox reruns only this column, not the whole page.
+    """
+    if selected_candidate:
+        st.markdown("#### 📋 Candidate Details")
+
+        # Get detailed information about the selected candidate
+        candidate_details = get_candidate_details(selected_candidate)
+
+        if candidate_details:
+            # Display summary metrics
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("📁 Total Files", candidate_details['total_files'])
+            with col_b:
+                st.metric("📊 Metadata Records", len(candidate_details['metadata_records']))
+            with col_c:
+                st.metric("🔍 Skills Records", len(candidate_details['normal_records']))
+
+            # Show detailed records
+            if candidate_details['metadata_records']:
+                st.markdown("##### 📊 Metadata Records")
+                metadata_df = pd.DataFrame(
+                    candidate_details['metadata_records'],
+                    columns=["Filename", "University", "Position", "Salary", "Employment", "Citizenship"]
+                )
+                st.dataframe(metadata_df, hide_index=True, use_container_width=True)
+
+            if candidate_details['normal_records']:
+                st.markdown("##### 🛠️ Skills Records")
+                normal_df = pd.DataFrame(candidate_details['normal_records'], columns=["Filename", "Skills"])
+                st.dataframe(normal_df, hide_index=True, use_container_width=True)
+
+            st.markdown("---")
 
-#     cur.close()
-#     conn.close()
+            # Deletion section with confirmation
+            st.markdown("##### ⚠️ Danger Zone")
+
+            # Two-step confirmation process
+            confirm_checkbox = st.checkbox(
+                f"I understand that deleting **{selected_candidate}** will permanently remove all their records",
+                key=f"confirm_{selected_candidate}"
+            )
+
+            if confirm_checkbox:
+                st.error("🚨 **Final Warning**: This action cannot be undone!")
+
+                delete_button = st.button(
+                    f"🗑️ DELETE {selected_candidate}",
+                    type="primary",
+                    use_container_width=True,
+                    key=f"delete_{selected_candidate}"
+                )
+
+                if delete_button:
+                    with st.spinner(f"🗑️ Deleting all records for {selected_candidate}..."):
+                        deletion_result = delete_candidate_records(selected_candidate)
+
+                    if deletion_result['total_deleted'] > 0:
+                        st.success(
+                            f"✅ **Successfully deleted {selected_candidate}!**\n\n"
+                            f"📊 Metadata records deleted: {deletion_result['metadata_deleted']}\n\n"
+                            f"🔍 Skills records deleted: {deletion_result['normal_deleted']}\n\n"
+                            f"🏷️ Category‐score rows deleted: {deletion_result['score_deleted']}\n\n"
+                            f"📁 Total records deleted: {deletion_result['total_deleted']}"
+                        )
+
+                        # Clear the selection by rerunning
+                        st.rerun()
+                    else:
+                        st.error("❌ No records were deleted. Please check if the candidate exists.")
+
+        else:
+            st.error("❌ Could not retrieve candidate details.")
+    else:
+        st.info("👆 Select a candidate from the left to view their details")
+
+
+def get_skill_categories() -> List[Tuple[int, str]]:
+    """
+    Get all skill categories, sorted by name.
+    
+    Returns:
+        List of (id, name) tuples, or an empty list if an error occurs
+    """
+    try:
+        return _fetch_skill_categories()
+    except Exception as e:
+        st.error(f"Error fetching skill categories: {e}")
+        return []
+
+@st.cache_data(ttl=SKILL_CATEGORIES_CACHE_TTL, show_spinner=False)
+def _fetch_skill_categories() -> List[Tuple[int, str]]:
+    """The category list rarely changes; cached so every widget rerun of the tab skips Postgres."""
+    with pooled_connection(autocommit=True) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, name FROM skill_category ORDER BY name;")
+        rows = cur.fetchall()
+        cur.close()
+
+    return rows
 
 def render_skills_management_tab() -> None:
     """
     Render the skills management tab for viewing and managing skills categories.
     """
-    print("🔧" * 30)
-    print("render_skills_management_tab() CALLED!")
-    print("🔧" * 30)
-    
     st.markdown("### 🛠️ Manage Skill Categories")
-    conn = connect_postgres(load_env_vars())
-    cur = conn.cursor()
-
     # 1) Show existing categories
     st.write("#### Existing Categories")
-    cur.execute("SELECT id, name FROM skill_category ORDER BY name;")
-    rows = cur.fetchall()
-    
-    print(f"📊 Found {len(rows)} existing skill categories")
-    
+    rows = get_skill_categories()
+
     if rows:
-        st.table({
-            "ID": [r[0] for r in rows],
-            "Name": [r[1].title() for r in rows],
-        })
-        
+        categories_df = pd.DataFrame.from_records(rows, columns=["ID", "Name"])
+        categories_df["Name"] = categories_df["Name"].str.title()
+        st.table(categories_df)
+
         # Show count
         st.info(f"📊 Total categories: **{len(rows)}**")
     else:
@@ -1023,24 +780,27 @@ def render_skills_management_tab() -> None:
     if st.button("➕ Add Category", key="add_cat_btn"):
         cat = new_cat.strip()
         print(f"🆕 Attempting to add category: '{cat}'")
-        
+
         if not cat:
             print("❌ Category name is empty")
             st.session_state["cat_success"] = "❌ Name cannot be empty."
         else:
             try:
                 # Try to insert, returning the name if inserted
-                cur.execute("""
-                    INSERT INTO skill_category(name)
-                    VALUES (LOWER(%s))
-                    ON CONFLICT(name) DO NOTHING
-                    RETURNING name;
-                """, (cat,))
-                result = cur.fetchone()
-                
+                with pooled_connection(autocommit=True) as conn:
+                    cur = conn.cursor()
+                    cur.execute("""
+                        INSERT INTO skill_category(name)
+                        VALUES (LOWER(%s))
+                        ON CONFLICT(name) DO NOTHING
+                        RETURNING name;
+                    """, (cat,))
+                    result = cur.fetchone()
+                    cur.close()
+
                 if result:
                     # insertion happened
-                    conn.commit()
+                    _fetch_skill_categories.clear()
                     print(f"✅ Successfully added category: '{cat}'")
                     st.session_state["cat_success"] = f"Added category: **{cat}**"
                     st.session_state["cat_added"] = True
@@ -1048,9 +808,9 @@ def render_skills_management_tab() -> None:
                     # already existed
                     print(f"⚠️ Category already exists: '{cat}'")
                     st.session_state["cat_success"] = f"Category **{cat}** already exists."
-                
+
                 st.rerun()
-                
+
             except Exception as e:
                 print(f"❌ Error adding category: {e}")
                 st.session_state["cat_success"] = f"❌ Error adding category: {e}"
@@ -1062,30 +822,46 @@ def render_skills_management_tab() -> None:
     if st.session_state.get("del_success"):
         st.info(st.session_state["del_success"])  # Changed from st.warning to st.info
         del st.session_state["del_success"]
+    if st.session_state.get("del_warning"):
+        st.warning(st.session_state["del_warning"])
+        del st.session_state["del_warning"]
 
     # 6) Delete an existing category
     if rows:  # Only show if there are categories to delete
         st.markdown("#### 🗑️ Delete Individual Category")
         to_delete = st.selectbox(
             "Delete a category",
-            [r[1].title() for r in rows],
+            categories_df["Name"].tolist(),
             index=0 if rows else None
         )
         if st.button("🗑️ Delete Category", key="del_cat_btn"):
             print(f"🗑️ Attempting to delete category: '{to_delete}'")
-            
+
             try:
-                cur.execute(
-                    "DELETE FROM skill_category WHERE LOWER(name) = LOWER(%s);",
-                    (to_delete,)
-                )
-                deleted_count = cur.rowcount
-                conn.commit()
-                
+                with pooled_connection(autocommit=True) as conn:
+                    cur = conn.cursor()
+                    # Names are stored lowercased on insert, so compare the
+                    # bare column and let the unique index on name serve it
+                    cur.execute(
+                        "DELETE FROM skill_category WHERE name = LOWER(%s);",
+                        (to_delete,)
+                    )
+                    deleted_count = cur.rowcount
+                    cur.close()
+
+                if deleted_count == 0:
+                    # Legacy rows stored before names were lowercased don't match
+                    print(f"⚠️ No category deleted for: '{to_delete}'")
+                    st.session_state["del_warning"] = f"No category matching **{to_delete}** was deleted."
+                    st.rerun()
+
+                _fetch_skill_categories.clear()
+                _fetch_score_table.clear()
+
                 print(f"✅ Successfully deleted {deleted_count} category: '{to_delete}'")
                 st.session_state["del_success"] = f"Deleted category: **{to_delete}**"
                 st.rerun()
-                
+
             except Exception as e:
                 print(f"❌ Error deleting category: {e}")
                 st.session_state["del_success"] = f"❌ Error deleting category: {e}"
@@ -1096,7 +872,7 @@ def render_skills_management_tab() -> None:
     # 7) NEW: Delete All Categories section
     st.markdown("#### 🧹 Bulk Delete All Categories")
     st.info("⚠️ This will permanently delete **all** skill categories. Use this before ingesting a new job description.")
-    
+
     # Show delete all success message
     if st.session_state.get("delete_all_cats_success", False):
         st.success("✅ All skill categories have been deleted.")
@@ -1123,209 +899,193 @@ def render_skills_management_tab() -> None:
             st.rerun()
         else:
             print("🗑️ Attempting to delete ALL categories...")
-            
+
             try:
-                # Count categories before deletion
-                cur.execute("SELECT COUNT(*) FROM skill_category;")
-                count_before = cur.fetchone()[0]
+                # Count categories before deletion (the list shown above)
+                count_before = len(rows)
                 print(f"📊 Found {count_before} categories to delete")
-                
+
                 # Delete all categories
-                cur.execute("TRUNCATE TABLE skill_category RESTART IDENTITY CASCADE;")
-                conn.commit()
-                
+                with pooled_connection(autocommit=True) as conn:
+                    cur = conn.cursor()
+                    cur.execute("TRUNCATE TABLE skill_category RESTART IDENTITY CASCADE;")
+                    cur.close()
+                _fetch_skill_categories.clear()
+                _fetch_score_table.clear()
+
                 print(f"✅ Successfully deleted all {count_before} categories")
-                
+
                 # Set success flags
                 st.session_state["delete_all_cats_success"] = True
                 st.session_state["deleted_all_cats_once"] = True
-                
+
                 st.rerun()
-                
+
             except Exception as e:
                 print(f"❌ Error deleting all categories: {e}")
                 st.session_state["del_success"] = f"❌ Failed to delete all categories: {e}"
                 st.rerun()
-
-    cur.close()
-    conn.close()
-    print("🔧 render_skills_management_tab() completed")
     
    
-# def render_score_table() -> None:
-#     """
-#     Render the skill category scores for each resume.
-#     """
-#     st.markdown("### 📈 Candidate Skill Category Scores")
-
-#     # —– Fetch data from Postgres —–
-#     env  = load_env_vars()
-#     conn = connect_postgres(env)
-#     cur  = conn.cursor()
-#     cur.execute("""
-#         SELECT 
-#           s.candidate_key || ' / ' || s.filename AS resume_id,
-#           c.name AS category,
-#           s.score
-#         FROM resume_category_score s
-#         JOIN skill_category c ON c.id = s.category_id
-#     """)
-#     rows = cur.fetchall()
-#     cur.close()
-#     conn.close()
-
-#     if not rows:
-#         st.info("No category scores yet.")
-#     else:
-#         # 1) Build the pivot table
-#         df    = pd.DataFrame(rows, columns=["resume_id", "category", "score"])
-#         pivot = (
-#             df.pivot(index="resume_id", columns="category", values="score")
-#               .fillna(0)
-#               .astype(int)
-#         )
-
-#         # 2) Compute an “average score” helper column and sort by it
-#         pivot["avg_score"] = pivot.mean(axis=1)
-#         pivot = pivot.sort_values("avg_score", ascending=False).drop("avg_score", axis=1)
-
-#         # 3) Page through top N by average score
-#         total = len(pivot)
-#         show_n = st.slider(
-#             "Show top N resumes by average score",
-#             min_value=1,
-#             max_value=min(50, total),
-#             value=min(10, total)
-#         )
-
-#         # 4) Display and allow CSV download
-#         display_df = pivot.head(show_n)
-#         st.dataframe(display_df)
-#         csv = display_df.to_csv().encode("utf-8")
-#         st.download_button("⬇️ Download CSV", csv, "category_scores.csv", "text/csv")
-        
 
-# def render_score_table() -> None:
-#     """
-#     Render the skill category scores for each resume with search and filters.
-#     """
-#     st.markdown("### 📈 Candidate Skill Category Scores")
-
-#     # —– Fetch data from Postgres —–
-#     env  = load_env_vars()
-#     conn = connect_postgres(env)
-#     cur  = conn.cursor()
-#     cur.execute("""
-#         SELECT 
-#           s.candidate_key || ' / ' || s.filename AS resume_id,
-#           s.candidate_key,
-#           c.name AS category,
-#           s.score
-#         FROM resume_category_score s
-#         JOIN skill_category c ON c.id = s.category_id
-#     """)
-#     rows = cur.fetchall()
-#     cur.close()
-#     conn.close()
-
-#     if not rows:
-#         st.info("No category scores yet.")
-#         return
-
-#     # 1) Build the pivot table
-#     df = pd.DataFrame(rows, columns=["resume_id", "candidate_key", "category", "score"])
-#     pivot = (
-#         df.pivot(index="resume_id", columns="category", values="score")
-#           .fillna(0)
-#           .astype(int)
-#     )
-    
-#     # Add candidate_key column for filtering
-#     candidate_mapping = df.drop_duplicates('resume_id').set_index('resume_id')['candidate_key']
-#     pivot['candidate_key'] = candidate_mapping
-    
-#     # 2) Add average score column
-#     skill_columns = [col for col in pivot.columns if col != 'candidate_key']
-#     pivot["Average Score"] = pivot[skill_columns].mean(axis=1).round(2)
-    
-#     # 3) Reorder columns: candidate_key, Average Score, then skills (no duplicates)
-#     other_skills = [col for col in skill_columns if col != 'Average Score']  
-#     pivot = pivot[['candidate_key', 'Average Score'] + other_skills]
-def render_score_table() -> None:
+def _fetch_score_rows() -> pd.DataFrame:
+    """Score rows joined with file names and PDF URLs, one row per candidate and category."""
+    # Enhanced query to fetch PDF URLs. COPY streams the result as CSV straight
+    # into pandas, without building a Python tuple per row first.
+    buf = io.StringIO()
+    with pooled_connection(autocommit=True) as conn:
+        cur  = conn.cursor()
+        cur.copy_expert("""
+            COPY (
+            SELECT 
+              s.candidate_key AS candidate_name,
+              s.candidate_key,
+              c.name AS category,
+              s.score,
+              rm.filename AS metadata_file,
+              rm.pdf_url AS mikomiko_url,
+              rn.filename AS resume_file,
+              rn.pdf_url AS resume_url
+            FROM resume_category_score s
+            JOIN skill_category c ON c.id = s.category_id
+            -- One file per candidate from each table, so a candidate with several
+            -- resumes doesn't multiply every score row
+            LEFT JOIN LATERAL (
+                SELECT filename, pdf_url FROM resumes_metadata
+                WHERE candidate_key = s.candidate_key
+                ORDER BY filename LIMIT 1
+            ) rm ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT filename, pdf_url FROM resumes_normal
+                WHERE candidate_key = s.candidate_key
+                ORDER BY filename LIMIT 1
+            ) rn ON TRUE
+            ) TO STDOUT WITH (FORMAT CSV, HEADER)
+        """, buf)
+        cur.close()
+
+    buf.seek(0)
+    # Only empty fields are NULLs; names like "NA" or "123" stay strings
+    df = pd.read_csv(
+        buf, keep_default_na=False, na_values=[""],
+        dtype={"candidate_name": str, "candidate_key": str, "category": str}
+    )
+    # Missing files/URLs become None rather than NaN, which is truthy
+    file_cols = ["metadata_file", "mikomiko_url", "resume_file", "resume_url"]
+    df[file_cols] = df[file_cols].astype(object).where(df[file_cols].notna(), None)
+    return df
+
+# cache_resource hands every rerun the same objects instead of unpickling a copy
+# of the pivot; callers must treat them as read-only.
+@st.cache_resource(ttl=OVERVIEW_CACHE_TTL, show_spinner=False)
+def _fetch_score_table() -> Optional[Dict]:
     """
-    Render the skill category scores for each resume with search and filters.
+    Score pivot (one row per candidate, one column per category) plus PDF file
+    mappings; cached so reruns skip both the Postgres fetch and the pivot.
+    Returns None when nothing has been scored yet.
     """
-    st.markdown("### 📈 Candidate Skill Category Scores")
+    df = _fetch_score_rows()
 
-    # Enhanced query to fetch PDF URLs
-    env  = load_env_vars()
-    conn = connect_postgres(env)
-    cur  = conn.cursor()
-    cur.execute("""
-        SELECT 
-          s.candidate_key AS candidate_name,
-          s.candidate_key,
-          c.name AS category,
-          s.score,
-          rm.filename AS metadata_file,
-          rm.pdf_url AS mikomiko_url,
-          rn.filename AS resume_file,
-          rn.pdf_url AS resume_url
-        FROM resume_category_score s
-        JOIN skill_category c ON c.id = s.category_id
-        LEFT JOIN resumes_metadata rm ON s.candidate_key = rm.candidate_key
-        LEFT JOIN resumes_normal rn ON s.candidate_key = rn.candidate_key
-    """)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
-
-    if not rows:
-        st.info("No category scores yet.")
-        return
+    if df.empty:
+        return None
+    
+    candidates = df.drop_duplicates('candidate_name').set_index('candidate_name')
+    
+    # Build file mappings with URLs (first row per candidate)
+    file_mappings = (
+        candidates[["metadata_file", "mikomiko_url", "resume_file", "resume_url"]]
+          .rename(columns={"metadata_file": "mikomiko_file"})
+          .to_dict("index")
+    )
     
-    # Build file mappings with URLs using ALL 8 columns
-    file_mappings = {}
-    df_full = pd.DataFrame(rows, columns=[
-        "candidate_name", "candidate_key", "category", "score", 
-        "metadata_file", "mikomiko_url", "resume_file", "resume_url"
-    ])
-    
-    for _, row in df_full.iterrows():
-        candidate = row['candidate_name']
-        if candidate not in file_mappings:
-            file_mappings[candidate] = {
-                'mikomiko_file': row['metadata_file'],
-                'mikomiko_url': row['mikomiko_url'],
-                'resume_file': row['resume_file'],
-                'resume_url': row['resume_url']
-            }
-    
-    # 1) Build the pivot table using candidate names (only need first 4 columns)
-    df = pd.DataFrame(rows, columns=["candidate_name", "candidate_key", "category", "score", 
-                                    "metadata_file", "mikomiko_url", "resume_file", "resume_url"])
-    
-    # Keep only the columns we need for the pivot
-    df_pivot = df[["candidate_name", "candidate_key", "category", "score"]]
-    
-    pivot = (
-        df_pivot.pivot(index="candidate_name", columns="category", values="score")
-          .fillna(0)
-          .astype(int)
+    # 1) Build the candidate x category score matrix by scattering each row's
+    # score into its (candidate, category) cell; unscored cells stay 0. If a
+    # candidate was scored twice for a category (several files), one score wins.
+    # Scores are counts of skill mentions: int8 when they all fit (the usual
+    # case), int16 otherwise, so a large count can never wrap around.
+    candidate_codes, candidate_names = pd.factorize(df["candidate_name"], sort=True)
+    category_codes, categories = pd.factorize(df["category"], sort=True)
+    score_dtype = np.int8 if df["score"].max() <= np.iinfo(np.int8).max else np.int16
+    scores = np.zeros((len(candidate_names), len(categories)), dtype=score_dtype)
+    scores[candidate_codes, category_codes] = df["score"].to_numpy(dtype=score_dtype)
+
+    pivot = pd.DataFrame(
+        scores,
+        index=pd.Index(candidate_names, name="candidate_name"),
+        columns=pd.Index(categories, name="category"),
     )
     
     # Add candidate_key column for filtering
-    candidate_mapping = df_pivot.drop_duplicates('candidate_name').set_index('candidate_name')['candidate_key']
-    pivot['candidate_key'] = candidate_mapping
+    pivot['candidate_key'] = candidates['candidate_key']
     
     # 2) Add average score column
-    skill_columns = [col for col in pivot.columns if col != 'candidate_key']
-    pivot["Average Score"] = pivot[skill_columns].mean(axis=1).round(2)
+    skill_columns = list(categories)
+    # Mean straight off the integer score matrix; float64 so the rounded
+    # values display exactly (float32 would show e.g. 72.33000183)
+    pivot["Average Score"] = scores.mean(axis=1, dtype=np.float64).round(2)
     
     # 3) Reorder columns: candidate_key, Average Score, then skills
     other_skills = [col for col in skill_columns if col != 'Average Score']  
     pivot = pivot[['candidate_key', 'Average Score'] + other_skills]
-    
+
+    return {
+        'pivot': pivot,
+        # Each candidate's best score in any category, in pivot row order, so
+        # the minimum-score filter compares one value per row
+        'best_scores': scores.max(axis=1),
+        # Lowercased keys as an Arrow array, so the search box is one
+        # vectorised substring scan instead of a regex per row
+        'search_keys': pa.array(pivot['candidate_key'].str.lower(), type=pa.string(), from_pandas=True),
+        'skill_columns': skill_columns,
+        'other_skills': other_skills,
+        'file_mappings': file_mappings,
+        # Encoded CSV downloads, filled on first render per filter/sort state;
+        # a rebuilt score table starts with an empty dict
+        'csv_exports': {}
+    }
+
+def _score_export_csv(csv_exports: Dict[tuple, bytes], key: tuple, frame: pd.DataFrame) -> bytes:
+    """CSV download bytes for a score frame, encoded once per score table and key."""
+    with _SCORE_EXPORT_LOCK:
+        data = csv_exports.get(key)
+    if data is None:
+        # Remove candidate_key from the export (used for filtering only); encode
+        # outside the lock so sessions don't queue behind each other
+        data = frame.drop('candidate_key', axis=1).to_csv().encode("utf-8")
+        with _SCORE_EXPORT_LOCK:
+            if key not in csv_exports and len(csv_exports) >= SCORE_EXPORT_CACHE_SIZE:
+                csv_exports.pop(next(iter(csv_exports)), None)
+            csv_exports[key] = data
+    return data
+
+def render_score_table() -> None:
+    """
+    Render the skill category scores for each resume with search and filters.
+    """
+    st.markdown("### 📈 Candidate Skill Category Scores")
+
+    score_table = _fetch_score_table()
+
+    if score_table is None:
+        st.info("No category scores yet.")
+        return
+
+    _render_score_results(**score_table)
+
+@st.fragment
+def _render_score_results(
+    pivot: pd.DataFrame,
+    best_scores: np.ndarray,
+    search_keys: pa.Array,
+    skill_columns: List[str],
+    other_skills: List[str],
+    file_mappings: Dict[str, Dict],
+    csv_exports: Dict[tuple, bytes],
+) -> None:
+    """
+    Filters, pagination and results of the score table. Runs as a fragment so
+    search, sort and paging rerun only this part, reusing the built pivot.
+    """
     total = len(pivot)
     st.info(f"📊 **{total} candidates** in database")
 
@@ -1362,19 +1122,22 @@ def render_score_table() -> None:
         )
 
     # === APPLY FILTERS AND SORTING ===
-    filtered_pivot = pivot.copy()
+    # Filters combine into one row mask over the cached pivot, which is then
+    # sliced once; the cached frame itself is never modified
+    mask = np.ones(total, dtype=bool)
     
     # Apply search filter
     if search_term:
-        mask = filtered_pivot['candidate_key'].str.contains(search_term, case=False, na=False)
-        filtered_pivot = filtered_pivot[mask]
-        st.info(f"🔍 Search results: **{len(filtered_pivot)}** candidates match '{search_term}'")
+        matches = pc.match_substring(search_keys, search_term.lower())
+        mask &= pc.fill_null(matches, False).to_numpy(zero_copy_only=False)
+        st.info(f"🔍 Search results: **{mask.sum()}** candidates match '{search_term}'")
     
     # Apply minimum score filter
     if min_score_filter > 0:
-        mask = (filtered_pivot[skill_columns] >= min_score_filter).any(axis=1)
-        filtered_pivot = filtered_pivot[mask]
-        st.info(f"📊 Filter results: **{len(filtered_pivot)}** candidates with score ≥{min_score_filter}")
+        mask &= best_scores >= min_score_filter
+        st.info(f"📊 Filter results: **{mask.sum()}** candidates with score ≥{min_score_filter}")
+    
+    filtered_pivot = pivot[mask]
     
     
     # CRITICAL FIX: Apply sorting BEFORE pagination
@@ -1447,7 +1210,7 @@ def render_score_table() -> None:
                 help="Go to first page" if not first_page_disabled else "Already on first page"
             ):
                 st.session_state["go_to_first"] = True
-                st.rerun()
+                st.rerun(scope="fragment")
         with col_b:
             # Disable "Last Page" if already on last page
             last_page_disabled = (current_page >= total_pages)
@@ -1458,7 +1221,7 @@ def render_score_table() -> None:
                 help="Go to last page" if not last_page_disabled else "Already on last page"
             ):
                 st.session_state["go_to_last"] = True
-                st.rerun()
+                st.rerun(scope="fragment")
 
     # === DISPLAY PAGINATED RESULTS (AFTER SORTING) ===
     start_idx = (current_page - 1) * page_size
@@ -1507,7 +1270,9 @@ def render_score_table() -> None:
     
     with col1:
         # Download current filtered results
-        csv_filtered = filtered_pivot.drop('candidate_key', axis=1).to_csv().encode("utf-8")
+        csv_filtered = _score_export_csv(
+            csv_exports, ("filtered", search_term, min_score_filter, sort_by), filtered_pivot
+        )
         st.download_button(
             "⬇️ Download Filtered Results",
             csv_filtered,
@@ -1518,7 +1283,7 @@ def render_score_table() -> None:
     
     with col2:
         # Download all results
-        csv_all = pivot.drop('candidate_key', axis=1).to_csv().encode("utf-8")
+        csv_all = _score_export_csv(csv_exports, ("all",), pivot)
         st.download_button(
             "⬇️ Download All Results",
             csv_all,
@@ -1630,34 +1395,33 @@ def render_delete_all_resumes() -> None:
                 # Import PDF server delete function
                 from ..frontend.pdf_server import delete_all_pdf_files
                 
-                env = load_env_vars()
-                conn = connect_postgres(env)
-                cur = conn.cursor()
-                
                 print(f"🗑️ Starting bulk deletion of all data...")
-                
-                # Delete all PDF files from server (simplified approach)
+
+                with pooled_connection() as conn:
+                    cur = conn.cursor()
+
+                    # Delete all database records
+                    print(f"🗑️ Deleting all database records...")
+                    cur.execute("""
+                        TRUNCATE TABLE
+                          public.resumes_metadata,
+                          public.resumes_normal,
+                          public.resume_category_score
+                        RESTART IDENTITY CASCADE;
+                    """)
+                    cur.close()
+
+                # Files go once the TRUNCATE has durably committed, without
+                # holding a pooled connection while the server deletes them
                 print(f"🗑️ Deleting all PDF files from server...")
                 pdf_deletion_success = delete_all_pdf_files()
-                
+
                 if pdf_deletion_success:
                     print(f"✅ All PDF files deleted from server")
                 else:
                     print(f"⚠️ Warning: PDF file deletion may have failed")
-                
-                # Delete all database records
-                print(f"🗑️ Deleting all database records...")
-                cur.execute("""
-                    TRUNCATE TABLE
-                      public.resumes_metadata,
-                      public.resumes_normal,
-                      public.resume_category_score
-                    RESTART IDENTITY CASCADE;
-                """)
-                conn.commit()
-                cur.close()
-                conn.close()
 
+                clear_overview_caches()
                 print(f"✅ Deleted all database records and PDF files")
 
                 # instead of st.success(), set a flag and rerun
@@ -1671,10 +1435,6 @@ def render_delete_all_resumes() -> None:
 
 def render_job_description_main_content() -> None:
     """Main content area for job description processing."""
-    print("🔥" * 30)
-    print("render_job_description_main_content() CALLED!")
-    print("🔥" * 30)
-    
     st.markdown("### 📄 Job Description Analysis")
     st.markdown("Upload a job description PDF to extract required skills and save them to the database.")
     
@@ -1821,61 +1581,71 @@ def process_job_description_pdf(uploaded_file):
         
 # Add all the helper functions here...
 def extract_pdf_text_with_ocr(uploaded_file) -> str:
-    """Extract text from uploaded PDF file using OCR and text extraction."""
+    """Extract text from uploaded PDF file, falling back to OCR per page."""
+    pdf_bytes = uploaded_file.getvalue()
+    return _extract_pdf_text(pdf_bytes)
+
+# Keyed on the PDF bytes, so reruns with the same upload skip the OCR
+@st.cache_data(show_spinner=False)
+def _extract_pdf_text(pdf_bytes: bytes) -> str:
     import fitz  # PyMuPDF
-    from pdf2image import convert_from_bytes
     import pytesseract
-    from PIL import Image
-    import io
     
     try:
-        # First, try direct text extraction with PyMuPDF
-        pdf_bytes = uploaded_file.read()
-        uploaded_file.seek(0)  # Reset file pointer
-        
-        # Method 1: Direct text extraction
+        # Method 1: Direct text extraction, page by page
         doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        direct_text = ""
-        
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            direct_text += page.get_text()
-        
-        doc.close()
-        
-        # If we got good text directly, use it
-        if len(direct_text.strip()) > 100:  # Reasonable amount of text
-            return direct_text.strip()
-        
-        # Method 2: OCR if direct extraction failed
-        st.info("📸 Direct text extraction yielded limited results. Using OCR...")
-        
-        # Convert PDF to images
-        images = convert_from_bytes(pdf_bytes, dpi=300)
+        try:
+            page_texts = [page.get_text() for page in doc]
+            
+            # Method 2: OCR only the pages without a usable text layer (scans),
+            # rendered straight from the already-open document
+            scanned_pages = [i for i, text in enumerate(page_texts) if len(text.strip()) < OCR_MIN_PAGE_CHARS]
+            if not scanned_pages:
+                return "".join(page_texts).strip()
+            
+            st.info(f"📸 {len(scanned_pages)} of {doc.page_count} pages have no text layer. Using OCR...")
+            images = [doc[i].get_pixmap(dpi=OCR_DPI).pil_image() for i in scanned_pages]
+        finally:
+            doc.close()
         
-        ocr_text = ""
-        for i, image in enumerate(images):
-            # Use pytesseract for OCR
-            page_text = pytesseract.image_to_string(image, lang='eng')
-            ocr_text += f"\n--- Page {i+1} ---\n{page_text}"
+        # pytesseract shells out to tesseract, so threads are enough to keep
+        # every core busy; map() keeps the pages in order
+        with concurrent.futures.ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS) as executor:
+            ocr_texts = executor.map(lambda image: pytesseract.image_to_string(image, lang='eng'), images)
+            for i, page_text in zip(scanned_pages, ocr_texts):
+                page_texts[i] = f"\n--- Page {i+1} ---\n{page_text}"
         
-        return ocr_text.strip()
+        return "".join(page_texts).strip()
         
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
 
-def extract_skills_from_job_description(job_text: str) -> List[str]:
-    """Use AI to extract skill categories from job description text."""
+@st.cache_resource
+def get_skills_client():
+    """Build the skills-extraction LLM client once per process instead of on every rerun."""
     from ..backend.model import Qwen2VLClient
-    
-    # Initialize Qwen client
-    qwen = Qwen2VLClient(
+
+    return Qwen2VLClient(
         host="http://localhost",
         port=8001,
         model="Qwen/Qwen2.5-VL-7B-Instruct",
         temperature=0.0
     )
+
+def extract_skills_from_job_description(job_text: str) -> List[str]:
+    """Use AI to extract skill categories from job description text."""
+    try:
+        return _fetch_job_skills(job_text)
+    except Exception as e:
+        print(f"Error parsing AI response: {e}")
+        # Fallback: try to extract skills manually
+        return extract_skills_fallback(job_text)
+
+# Cached per job text; a failed call raises, so fallback results are never cached
+@st.cache_data(show_spinner=False)
+def _fetch_job_skills(job_text: str) -> List[str]:
+    qwen = get_skills_client()
     
     SKILLS_EXTRACTION_PROMPT = f"""
 You are an expert HR analyst. Analyze the following job description and extract ALL technical skills, tools, technologies, and competencies required for this position.
@@ -1903,99 +1673,87 @@ RULES:
 JSON Array of Skills:
 """
     
-    try:
-        reply = qwen.chat_completion(
-            question=SKILLS_EXTRACTION_PROMPT,
-            system_prompt="You are an expert at extracting technical skills from job descriptions. Return only clean JSON arrays."
-        ).strip()
-        
-        # Clean up response
-        if reply.startswith("```"):
-            import re
-            json_match = re.search(r'\[.*\]', reply, re.DOTALL)
-            if json_match:
-                reply = json_match.group(0)
-        
-        # Parse JSON
-        import json
-        skills = json.loads(reply)
-        
-        if isinstance(skills, list):
-            # Clean and validate skills
-            cleaned_skills = []
-            for skill in skills:
-                if isinstance(skill, str) and len(skill.strip()) > 0:
-                    cleaned_skill = skill.strip().title()  # Proper case
-                    if cleaned_skill not in cleaned_skills:  # Avoid duplicates
-                        cleaned_skills.append(cleaned_skill)
-            
-            return cleaned_skills
-        else:
-            raise ValueError("Response is not a list")
-            
-    except Exception as e:
-        print(f"Error parsing AI response: {e}")
-        # Fallback: try to extract skills manually
-        return extract_skills_fallback(job_text)
-    
+    reply = qwen.chat_completion(
+        question=SKILLS_EXTRACTION_PROMPT,
+        system_prompt="You are an expert at extracting technical skills from job descriptions. Return only clean JSON arrays."
+    ).strip()
+
+    # Clean up response
+    if reply.startswith("```"):
+        json_match = re.search(r'\[.*\]', reply, re.DOTALL)
+        if json_match:
+            reply = json_match.group(0)
+
+    # Parse JSON
+    import json
+    skills = json.loads(reply)
+
+    if isinstance(skills, list):
+        # Clean and validate skills
+        cleaned_skills = []
+        for skill in skills:
+            if isinstance(skill, str) and len(skill.strip()) > 0:
+                cleaned_skill = skill.strip().title()  # Proper case
+                if cleaned_skill not in cleaned_skills:  # Avoid duplicates
+                    cleaned_skills.append(cleaned_skill)
+
+        return cleaned_skills
+    else:
+        raise ValueError("Response is not a list")
+    
+# Common technical skills to look for, as one alternation so the fallback
+# scans the job text once; compiled at import rather than per call
+_FALLBACK_SKILLS_RE = re.compile(
+    r'\b('
+    r'Python|Java|JavaScript|TypeScript|C\+\+|C#|PHP|Ruby|Go|Kotlin|Swift|Scala|R|'
+    r'HTML|CSS|React|Vue|Angular|Node\.js|Express|Django|Flask|Laravel|Spring|'
+    r'SQL|MySQL|PostgreSQL|MongoDB|Redis|Oracle|SQLite|'
+    r'AWS|Azure|GCP|Docker|Kubernetes|Jenkins|GitLab|CI/CD|Terraform|'
+    r'Git|GitHub|Jira|Confluence|Linux|Unix|Windows|Mac|'
+    r'Agile|Scrum|DevOps|TDD|API|REST|GraphQL|'
+    r'Machine Learning|Data Science|AI|Analytics|Pandas|NumPy|TensorFlow|PyTorch'
+    r')\b',
+    re.IGNORECASE,
+)
+
 def extract_skills_fallback(job_text: str) -> List[str]:
     """Fallback method to extract skills using keyword matching."""
-    import re
-    
-    # Common technical skills to look for
-    skill_patterns = [
-        r'\b(Python|Java|JavaScript|TypeScript|C\+\+|C#|PHP|Ruby|Go|Kotlin|Swift|Scala|R)\b',
-        r'\b(HTML|CSS|React|Vue|Angular|Node\.js|Express|Django|Flask|Laravel|Spring)\b',
-        r'\b(SQL|MySQL|PostgreSQL|MongoDB|Redis|Oracle|SQLite)\b',
-        r'\b(AWS|Azure|GCP|Docker|Kubernetes|Jenkins|GitLab|CI/CD|Terraform)\b',
-        r'\b(Git|GitHub|Jira|Confluence|Linux|Unix|Windows|Mac)\b',
-        r'\b(Agile|Scrum|DevOps|TDD|API|REST|GraphQL)\b',
-        r'\b(Machine Learning|Data Science|AI|Analytics|Pandas|NumPy|TensorFlow|PyTorch)\b'
-    ]
-    
-    found_skills = set()
-    
-    for pattern in skill_patterns:
-        matches = re.findall(pattern, job_text, re.IGNORECASE)
-        for match in matches:
-            found_skills.add(match.title())
+    found_skills = {match.title() for match in _FALLBACK_SKILLS_RE.findall(job_text)}
     
     return list(found_skills) if found_skills else ["Web Development", "Programming", "Database Management"]
 
 
+_SKILL_CATEGORY_KEYWORDS = {
+    "Programming Languages": ["python", "java", "javascript", "typescript", "c++", "c#", "php", "ruby", "go", "kotlin", "swift", "scala", "r"],
+    "Web Technologies": ["html", "css", "react", "vue", "angular", "node.js", "express", "django", "flask", "laravel", "spring", "rest", "api"],
+    "Databases & Storage": ["sql", "mysql", "postgresql", "mongodb", "redis", "oracle", "sqlite", "database"],
+    "Cloud & DevOps": ["aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "gitlab", "ci/cd", "terraform", "devops"],
+    "Tools & Platforms": ["git", "github", "jira", "confluence", "linux", "unix", "windows", "mac"],
+    "Methodologies": ["agile", "scrum", "tdd", "machine learning", "data science", "ai", "analytics"]
+}
+
+# Every category's keywords in one anchored alternation with a named group per
+# category, so each skill is matched by a single regex call. Branches are tried
+# in dict order and each scans the whole skill, so the first category with any
+# keyword in the skill still wins; lastgroup names it.
+_SKILL_CATEGORY_NAMES = {f"c{i}": category for i, category in enumerate(_SKILL_CATEGORY_KEYWORDS)}
+_SKILL_CATEGORY_RE = re.compile(
+    "|".join(
+        f"(?:.*?(?P<c{i}>{'|'.join(map(re.escape, keywords))}))"
+        for i, keywords in enumerate(_SKILL_CATEGORY_KEYWORDS.values())
+    ),
+    re.DOTALL,
+)
+
 def categorize_extracted_skills(skills: List[str]) -> Dict[str, List[str]]:
     """Organize skills into logical categories."""
-    categories = {
-        "Programming Languages": [],
-        "Web Technologies": [],
-        "Databases & Storage": [],
-        "Cloud & DevOps": [],
-        "Tools & Platforms": [],
-        "Methodologies": [],
-        "Other Skills": []
-    }
-    
-    categorization_rules = {
-        "Programming Languages": ["python", "java", "javascript", "typescript", "c++", "c#", "php", "ruby", "go", "kotlin", "swift", "scala", "r"],
-        "Web Technologies": ["html", "css", "react", "vue", "angular", "node.js", "express", "django", "flask", "laravel", "spring", "rest", "api"],
-        "Databases & Storage": ["sql", "mysql", "postgresql", "mongodb", "redis", "oracle", "sqlite", "database"],
-        "Cloud & DevOps": ["aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "gitlab", "ci/cd", "terraform", "devops"],
-        "Tools & Platforms": ["git", "github", "jira", "confluence", "linux", "unix", "windows", "mac"],
-        "Methodologies": ["agile", "scrum", "tdd", "machine learning", "data science", "ai", "analytics"]
-    }
+    categories = {category: [] for category in _SKILL_CATEGORY_KEYWORDS}
+    categories["Other Skills"] = []
     
     for skill in skills:
-        skill_lower = skill.lower()
-        categorized = False
-        
-        for category, keywords in categorization_rules.items():
-            if any(keyword in skill_lower for keyword in keywords):
-                categories[category].append(skill)
-                categorized = True
-                break
-        
-        if not categorized:
-            categories["Other Skills"].append(skill)
+        match = _SKILL_CATEGORY_RE.match(skill.lower())
+        category = _SKILL_CATEGORY_NAMES[match.lastgroup] if match else "Other Skills"
+        categories[category].append(skill)
     
     # Remove empty categories
     return {k: v for k, v in categories.items() if v}
@@ -2005,85 +1763,45 @@ def categorize_extracted_skills(skills: List[str]) -> Dict[str, List[str]]:
 def save_job_skills_to_database(skills: List[str], clear_existing: bool = True) -> Dict[str, any]:
     """Save extracted skills to the skill_category table."""
     try:
-        print("=" * 50)
-        print("SAVING SKILLS TO DATABASE")
-        print("=" * 50)
-        print(f"Skills to save: {skills}")
-        print(f"Clear existing: {clear_existing}")
-        print(f"Number of skills: {len(skills)}")
-        
-        env = load_env_vars()
-        print(f"Environment loaded: {bool(env)}")
-        
-        conn = connect_postgres(env)
-        print("Database connection established")
-        
-        cur = conn.cursor()
-        
-        deleted_count = 0
-        added_count = 0
-        duplicate_count = 0
-        
-        # Clear existing skills if requested
-        if clear_existing:
-            print("Clearing existing skills...")
-            cur.execute("SELECT COUNT(*) FROM skill_category;")
-            deleted_count = cur.fetchone()[0]
-            print(f"Found {deleted_count} existing skills to delete")
-            
-            cur.execute("TRUNCATE TABLE skill_category RESTART IDENTITY CASCADE;")
-            print("Existing skills cleared")
-        
-        # Insert new skills
-        print("Inserting new skills...")
-        for i, skill in enumerate(skills, 1):
-            print(f"Processing skill {i}/{len(skills)}: '{skill}'")
-            
-            cur.execute("""
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+
+            deleted_count = 0
+
+            # Clear existing skills if requested
+            if clear_existing:
+                cur.execute("SELECT COUNT(*) FROM skill_category;")
+                deleted_count = cur.fetchone()[0]
+                cur.execute("TRUNCATE TABLE skill_category RESTART IDENTITY CASCADE;")
+
+            # Insert new skills in one multi-row INSERT; RETURNING lists only
+            # the names actually inserted, the rest were already present
+            inserted = execute_values(cur, """
                 INSERT INTO skill_category(name)
-                VALUES (LOWER(%s))
+                VALUES %s
                 ON CONFLICT(name) DO NOTHING
                 RETURNING name;
-            """, (skill,))
-            
-            result = cur.fetchone()
-            if result:
-                added_count += 1
-                print(f"  ✅ Added: {skill}")
-            else:
-                duplicate_count += 1
-                print(f"  ⚠️ Duplicate (skipped): {skill}")
-        
-        conn.commit()
-        print("Database changes committed")
-        
-        cur.close()
-        conn.close()
-        print("Database connection closed")
-        
-        final_result = {
+            """, [(skill,) for skill in skills], template="(LOWER(%s))", page_size=500, fetch=True)
+
+            added_count = len(inserted)
+            duplicate_count = len(skills) - added_count
+
+            cur.close()
+        _fetch_skill_categories.clear()
+        _fetch_score_table.clear()
+
+        print(f"✅ Saved job skills: {added_count} added, {duplicate_count} duplicates, {deleted_count} cleared")
+
+        return {
             'success': True,
             'added_count': added_count,
             'duplicate_count': duplicate_count,
             'deleted_count': deleted_count
         }
         
-        print("-" * 50)
-        print("FINAL RESULT:")
-        print(f"Success: {final_result['success']}")
-        print(f"Added: {final_result['added_count']}")
-        print(f"Duplicates: {final_result['duplicate_count']}")
-        print(f"Deleted: {final_result['deleted_count']}")
-        print("=" * 50)
-        
-        return final_result
-        
     except Exception as e:
         error_msg = str(e)
-        print("!" * 50)
-        print("ERROR SAVING SKILLS:")
-        print(f"Error: {error_msg}")
-        print("!" * 50)
+        print(f"❌ Error saving skills: {error_msg}")
         
         return {
             'success': False,
@@ -19,6 +19,7 @@ from resume_analyzer.ingestion.ingest_pg import ingest_all_resumes, load_env_var
 from resume_analyzer.ingestion.ingest_all import ingest_all_candidates
 from resume_analyzer.ingestion.helpers import (
     connect_postgres,
+    pooled_connection,
     ensure_resumes_table,
     ensure_resumes_normal_table,
     upsert_resume_metadata,
@@ -30,11 +31,12 @@ from resume_analyzer.backend.helpers import chat_with_resumes, fetch_candidate_k
 from resume_analyzer.ingestion.ingest_normal import ingest_resume_normal
 from resume_analyzer.ingestion.ingest_pg import extract_fields_with_qwen, qwen_client
 from resume_analyzer.ingestion.helpers import convert_docx_to_pdf_via_libreoffice, initialize_database
-from resume_analyzer.frontend.helpers import render_deletion_tab, render_overview_dashboard, get_quick_stats, render_skills_management_tab, render_score_table, render_delete_all_resumes, render_job_description_main_content
+from resume_analyzer.frontend.helpers import render_deletion_tab, render_overview_dashboard, get_quick_stats, render_skills_management_tab, render_score_table, render_delete_all_resumes, render_job_description_main_content, clear_overview_caches
 from resume_analyzer.backend.email_service import EmailService
 from resume_analyzer.frontend.email_ui_helpers import process_user_input
 from resume_analyzer.frontend.pdf_server import debug_pdf_server, test_pdf_server
 from resume_analyzer.ingestion.ingest_worker import run_ingestion_worker
+from resume_analyzer.backend.progress_tracker import ProgressTracker, PROGRESS_CACHE_TTL
 from pdf2image import convert_from_path
 import tempfile
 import json
@@ -64,6 +66,7 @@ def initialize_database_once():
         try:
             # Actually initialize the database here
             initialize_database()  # This calls the real initialization function
+            ProgressTracker()  # Creates/migrates ingestion_progress (adds the `state` column)
             
             print("✅ Database initialized successfully")
             st.session_state.db_initialized = True
@@ -113,40 +116,42 @@ def initialize_database_once():
 #         print(f"Error checking active sessions: {e}")
 #         return None
 
+@st.cache_data(ttl=PROGRESS_CACHE_TTL, show_spinner=False)
 def check_active_sessions():
     """Check for any active or recently completed ingestion sessions in the database"""
     try:
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
-        
-        # First check for RUNNING sessions
-        cur.execute("""
-            SELECT session_id, status, total_files, processed_files, current_file, 
-                   started_at, updated_at, metadata
-            FROM ingestion_progress 
-            WHERE status = 'RUNNING'
-            ORDER BY started_at DESC
-            LIMIT 1
-        """)
-        
-        session = cur.fetchone()
-        
-        # If no RUNNING session, check for recent COMPLETED sessions (in the last hour)
-        if not session:
+        # Polled on every auto-refresh, so borrow a pooled connection
+        with pooled_connection(autocommit=True) as conn:
+            cur = conn.cursor()
+            
+            # First check for RUNNING sessions
             cur.execute("""
-                SELECT session_id, status, total_files, processed_files, current_file, 
+                SELECT session_id, status, total_files, processed_files,
+                       COALESCE(state->>'last_file', current_file) AS current_file,
                        started_at, updated_at, metadata
                 FROM ingestion_progress 
-                WHERE status = 'COMPLETED' AND 
-                      updated_at > NOW() - INTERVAL '1 hour'
-                ORDER BY updated_at DESC
+                WHERE status = 'RUNNING'
+                ORDER BY started_at DESC
                 LIMIT 1
             """)
+        
             session = cur.fetchone()
         
-        cur.close()
-        conn.close()
+            # If no RUNNING session, check for recent COMPLETED sessions (in the last hour)
+            if not session:
+                cur.execute("""
+                    SELECT session_id, status, total_files, processed_files,
+                           COALESCE(state->>'last_file', current_file) AS current_file,
+                           started_at, updated_at, metadata
+                    FROM ingestion_progress 
+                    WHERE status = 'COMPLETED' AND 
+                          updated_at > NOW() - INTERVAL '1 hour'
+                    ORDER BY updated_at DESC
+                    LIMIT 1
+                """)
+                session = cur.fetchone()
+        
+            cur.close()
         
         if session:
             # Convert row to dictionary
@@ -200,6 +205,26 @@ def check_active_sessions():
 #     refresh_container.empty()
 #     st.rerun()
 
+def sync_overview_after_ingestion():
+    """
+    Drop cached dashboard reads once the session this browser watched run ends.
+    The worker refreshes the overview view before it publishes any final status
+    (COMPLETED, STOPPED or FAILED), so the caches only need clearing here.
+    """
+    session_id = st.session_state.get("watched_ingest_session")
+    if not session_id:
+        return
+    try:
+        progress = ProgressTracker().get_progress(session_id)
+    except Exception as e:
+        print(f"⚠️ Failed to check ingestion status: {e}")
+        return
+    if progress is None or progress['status'] in ('COMPLETED', 'STOPPED', 'FAILED'):
+        if st.session_state.get("overview_synced_session") != session_id:
+            clear_overview_caches(refresh_view=False)
+            st.session_state.overview_synced_session = session_id
+        del st.session_state["watched_ingest_session"]
+
 def render_persistent_progress(session_info):
     """Render progress bar based on database state"""
     
@@ -209,6 +234,11 @@ def render_persistent_progress(session_info):
     if session_info['status'] == 'COMPLETED':
         st.success("✅ **Ingestion Complete!**")
         
+        # The worker refreshed the overview view; drop this process's cached reads once
+        if st.session_state.get("overview_synced_session") != session_info['session_id']:
+            clear_overview_caches(refresh_view=False)
+            st.session_state.overview_synced_session = session_info['session_id']
+        
         # Display summary logs if available
         if session_info.get('metadata') and 'summary_logs' in session_info['metadata']:
             st.markdown("### 📋 Summary Logs")
@@ -259,19 +289,15 @@ def render_persistent_progress(session_info):
         # SINGLE BUTTON for completed sessions
         if st.button("✅ Clear Completed Session", type="primary"):
             try:
-                env = load_env_vars()
-                conn = connect_postgres(env)
-                cur = conn.cursor()
-                
-                cur.execute("""
-                    UPDATE ingestion_progress 
-                    SET status = 'ARCHIVED' 
-                    WHERE session_id = %s
-                """, (session_info['session_id'],))
-                
-                conn.commit()
-                cur.close()
-                conn.close()
+                with pooled_connection(autocommit=True) as conn:
+                    cur = conn.cursor()
+                    
+                    cur.execute("""
+                        UPDATE ingestion_progress 
+                        SET status = 'ARCHIVED' 
+                        WHERE session_id = %s
+                    """, (session_info['session_id'],))
+                    cur.close()
                 
                 st.success("✅ Session cleared! Ready for new ingestion.")
                 time.sleep(1)
@@ -284,6 +310,9 @@ def render_persistent_progress(session_info):
         
     
     else:
+        # Remember the run so its end clears the dashboard caches, however it ends
+        st.session_state.watched_ingest_session = session_info['session_id']
+        
         # Original in-progress display
         st.warning("🔄 **Ingestion in Progress - Safe to refresh or navigate!**")
         
@@ -307,20 +336,16 @@ def render_persistent_progress(session_info):
         # ADD THIS STOP BUTTON:
         if st.button("🛑 Stop Current Ingestion", type="secondary"):
             try:
-                env = load_env_vars()
-                conn = connect_postgres(env)
-                cur = conn.cursor()
-                
-                cur.execute("""
-                    UPDATE ingestion_progress 
-                    SET status = 'ARCHIVED',
-                        current_file = 'Stopping gracefully...'
-                    WHERE session_id = %s
-                """, (session_info['session_id'],))
-                
-                conn.commit()
-                cur.close()
-                conn.close()
+                with pooled_connection(autocommit=True) as conn:
+                    cur = conn.cursor()
+                    
+                    cur.execute("""
+                        UPDATE ingestion_progress 
+                        SET status = 'ARCHIVED',
+                            state = state || '{"last_file": "Stopping gracefully..."}'::jsonb
+                        WHERE session_id = %s
+                    """, (session_info['session_id'],))
+                    cur.close()
                 
                 # Show user feedback about graceful stopping
                 st.success("🛑 **Stop signal sent!**")
@@ -344,6 +369,7 @@ def render_persistent_progress(session_info):
 
 # Call this instead of direct initialization
 initialize_database_once()
+sync_overview_after_ingestion()
 
 # Initialize session state for pending emails
 if 'pending_email' not in st.session_state:
@@ -661,10 +687,6 @@ elif mode == "📥 Ingestion":
 elif mode == "📋 Skill Categories":
     # The sidebar already handles the skills management via render_skills_management_tab()
     # Now we render the main content area for job description processing
-    
-    print("🎯" * 50)
-    print("SKILL CATEGORIES MODE SELECTED!")
-    print("🎯" * 50)
     render_job_description_main_content()
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -981,6 +1003,9 @@ elif mode == "✏️ Manual Add":
                         cur.close()
                         conn.close()
                         
+                        # Fold the new candidate into the precomputed dashboard statistics
+                        clear_overview_caches()
+                        
                         st.success(f"🎉 Successfully processed {success_count} operations!")
                         
                         # Show PDF links if both uploads were successful
@@ -1038,40 +1063,43 @@ elif mode == "🔍 Filter Records":
         st.markdown("### 🔍 Filter Records")
 
         # Step 1: Fetch distinct values from the database for each non‐salary column
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
+        # Filter lookups run on a pooled connection, borrowed only for the queries
+        # so widget rendering doesn't hold it; autocommit so a failed query cannot
+        # leave the borrowed connection in an aborted transaction
+        with pooled_connection(autocommit=True) as conn:
+            cur = conn.cursor()
 
-        ensure_resumes_table(cur)
-        conn.commit()
+            ensure_resumes_table(cur)
 
-        def fetch_distinct(column: str) -> list:
-            cur.execute(f"SELECT DISTINCT {column} FROM public.resumes_metadata;")
-            return [row[0] for row in cur.fetchall() if row[0] is not None]
+            def fetch_distinct(column: str) -> list:
+                cur.execute(f"SELECT DISTINCT {column} FROM public.resumes_metadata;")
+                return [row[0] for row in cur.fetchall() if row[0] is not None]
 
-        # Fetch distinct skills categories from resumes_normal table
-        def fetch_distinct_skills_categories() -> list:
-            """Fetch all unique skills categories from resumes_normal table."""
-            try:
-                cur.execute("""
-                    SELECT DISTINCT unnest(skills_categories) as category 
-                    FROM public.resumes_normal 
-                    WHERE skills_categories IS NOT NULL 
-                    AND array_length(skills_categories, 1) > 0
-                    ORDER BY category;
-                """)
-                return [row[0] for row in cur.fetchall()]
-            except Exception as e:
-                st.error(f"Error fetching skills categories: {e}")
-                return []
+            # Fetch distinct skills categories from resumes_normal table
+            def fetch_distinct_skills_categories() -> list:
+                """Fetch all unique skills categories from resumes_normal table."""
+                try:
+                    cur.execute("""
+                        SELECT DISTINCT unnest(skills_categories) as category 
+                        FROM public.resumes_normal 
+                        WHERE skills_categories IS NOT NULL 
+                        AND array_length(skills_categories, 1) > 0
+                        ORDER BY category;
+                    """)
+                    return [row[0] for row in cur.fetchall()]
+                except Exception as e:
+                    st.error(f"Error fetching skills categories: {e}")
+                    return []
             
-        distinct_wd       = fetch_distinct("work_duration_category")
-        distinct_uni      = fetch_distinct("university")
-        distinct_applied_pos = fetch_distinct("applied_position") 
-        distinct_part     = fetch_distinct("part_or_full")
-        distinct_credit   = fetch_distinct("is_credit_bearing")
-        distinct_citizen  = fetch_distinct("citizenship")
-        distinct_skills   = fetch_distinct_skills_categories()
+            distinct_wd       = fetch_distinct("work_duration_category")
+            distinct_uni      = fetch_distinct("university")
+            distinct_applied_pos = fetch_distinct("applied_position") 
+            distinct_part     = fetch_distinct("part_or_full")
+            distinct_credit   = fetch_distinct("is_credit_bearing")
+            distinct_citizen  = fetch_distinct("citizenship")
+            distinct_skills   = fetch_distinct_skills_categories()
+
+            cur.close()
 
         # Step 2: Show multiselect filters for everything except salary
         sel_wd       = st.multiselect("Work Duration Category", distinct_wd)
@@ -1150,8 +1178,10 @@ elif mode == "🔍 Filter Records":
             """
             
             try:
-                cur.execute(query, tuple(params))
-                matched_candidates = [row[0] for row in cur.fetchall()]
+                with pooled_connection(autocommit=True) as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(query, tuple(params))
+                        matched_candidates = [row[0] for row in cur.fetchall()]
                 
                 # Store candidate names instead of filenames
                 st.session_state.matched_files = matched_candidates
@@ -1183,9 +1213,6 @@ elif mode == "🔍 Filter Records":
                 print(f"Query: {query}")
                 print(f"Params: {params}")
 
-        cur.close()
-        conn.close()
-
     # Chat interface section remains the same...
     matched = st.session_state.matched_files
     print("----------------------------------------------------")
@@ -2,9 +2,14 @@ import os
 import json
 import tempfile
 import psycopg2
+import psycopg2.errors
+import psycopg2.pool
+import threading
 import requests
 import subprocess
 from typing import Dict, Optional, List, Callable, Union
+from contextlib import contextmanager
+from functools import lru_cache
 from dateutil import parser
 import re
 from dotenv import load_dotenv
@@ -62,6 +67,8 @@ FAISS_INDEX_PATH = "./resume_faiss_index.bin"
 FAISS_METADATA_PATH = "./resume_faiss_metadata.pkl"
 CHUNK_SIZE = 512  # Characters per chunk
 CHUNK_OVERLAP = 50  # Overlap between chunks
+# Bump when the resumes_overview_mv definition changes so existing databases rebuild it
+OVERVIEW_VIEW_VERSION = 7
 
 def embed_sentences(sentences: List[str]) -> List[List[float]]:
     """
@@ -83,6 +90,82 @@ def connect_postgres(env: Dict[str,str]):
         port     = env["PG_PORT"]
     )
 
+# One pool per process and DSN; the ingestion worker runs in a forked process
+# and must not share sockets with the Streamlit parent.
+_PG_POOLS: Dict[tuple, psycopg2.pool.ThreadedConnectionPool] = {}
+_PG_POOLS_LOCK = threading.Lock()
+
+def get_pg_pool(env: Dict[str,str], minconn: int = 1, maxconn: int = 10) -> psycopg2.pool.ThreadedConnectionPool:
+    """Return the shared ThreadedConnectionPool for the PG_... environment."""
+    key = (os.getpid(), env["PG_HOST"], env["PG_PORT"], env["PG_DB"], env["PG_USER"])
+    pool = _PG_POOLS.get(key)
+    if pool is None:
+        with _PG_POOLS_LOCK:
+            pool = _PG_POOLS.get(key)
+            if pool is None:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    minconn,
+                    maxconn,
+                    dbname   = env["PG_DB"],
+                    user     = env["PG_USER"],
+                    password = env["PG_PASSWORD"],
+                    host     = env["PG_HOST"],
+                    port     = env["PG_PORT"]
+                )
+                _PG_POOLS[key] = pool
+    return pool
+
+@contextmanager
+def pooled_connection(env: Optional[Dict[str,str]] = None, autocommit: bool = False):
+    """
+    Borrow a connection from the shared pool for the duration of a `with` block.
+    Commits on success, rolls back on error and always returns the connection.
+    With autocommit=True each statement commits on its own (no BEGIN/COMMIT
+    round-trips), which suits single-statement writes.
+    """
+    pool = get_pg_pool(env or load_env_vars())
+    conn = pool.getconn()
+    # Skip connections already known to be dead (e.g. after a Postgres restart)
+    while conn.closed:
+        pool.putconn(conn, close=True)
+        conn = pool.getconn()
+    conn.autocommit = autocommit
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # A lost server connection can't be reused; discard it rather than roll back
+        broken = True
+        raise
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        broken = broken or bool(conn.closed)
+        if autocommit and not broken:
+            conn.autocommit = False
+        pool.putconn(conn, close=broken)
+
+def execute_prepared(cur, name: str, statement: str, params: tuple = ()):
+    """
+    EXECUTE a named server-side statement, PREPAREing `statement` first on
+    connections that don't have it yet. Pooled connections keep their prepared
+    statements, so the server parses and plans each one once per connection.
+    Only call this in autocommit mode: the failed EXECUTE would otherwise
+    abort the surrounding transaction.
+    """
+    stmt = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+    try:
+        cur.execute(stmt, params)
+    except psycopg2.errors.InvalidSqlStatementName:
+        cur.execute(f"PREPARE {name} AS {statement}")
+        cur.execute(stmt, params)
+
+# The PG_... settings are fixed once .env is loaded at import, so read them once
+# per process; every pooled_connection() call goes through here.
+@lru_cache(maxsize=None)
 def load_env_vars():
     """Load environment variables (or complain if missing)."""
     env = {
@@ -144,6 +227,48 @@ def ensure_resumes_table(cur):
     """)
 
 
+def migrate_resumes_table(cur):
+    """
+    Add the derived columns and indexes resumes_metadata has gained since it was
+    first created. ALTER TABLE takes an ACCESS EXCLUSIVE lock even when the column
+    already exists, so this only runs from initialize_database(), not per query.
+    """
+    # Overview and deletion look rows up by candidate_key; the INCLUDE columns
+    # let the candidate detail query run as an index-only scan
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_resumes_metadata_candidate_key
+        ON public.resumes_metadata (candidate_key)
+        INCLUDE (filename, university, applied_position, salary, part_or_full, citizenship);
+    """)
+    # The overview's salary range, fixed on write; the dashboard only groups by it
+    cur.execute("""
+        ALTER TABLE public.resumes_metadata
+        ADD COLUMN IF NOT EXISTS salary_bucket TEXT
+        GENERATED ALWAYS AS (
+            CASE
+                WHEN salary = 'any' THEN 'Flexible'
+                WHEN salary ~ '^[0-9]{1,9}$' THEN
+                    (ARRAY['< $1000', '$1000-1200', '$1200-1400', '$1400-1600', '$1600+'])
+                    [width_bucket(salary::integer, ARRAY[1000, 1200, 1400, 1600]) + 1]
+                WHEN salary IS NOT NULL THEN 'Other'
+            END
+        ) STORED;
+    """)
+    # Partial indexes matching the overview's `<col> IS NOT NULL` filters, so each
+    # distribution is an index-only scan over the non-null rows
+    for column in ("university", "part_or_full", "citizenship", "salary_bucket"):
+        cur.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_resumes_metadata_{column}_not_null
+            ON public.resumes_metadata ({column})
+            WHERE {column} IS NOT NULL;
+        """)
+    # Case-insensitive prefix search in the deletion tab
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_resumes_metadata_candidate_key_prefix
+        ON public.resumes_metadata (lower(candidate_key) text_pattern_ops);
+    """)
+
+
 # def upsert_resume_metadata(
 #     cur,
 #     filename: str,
@@ -289,6 +414,213 @@ def ensure_resumes_normal_table(cur):
         pdf_url         TEXT
     );
     """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_resumes_normal_candidate_key
+    ON public.resumes_normal (candidate_key);
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_resumes_normal_candidate_key_prefix
+    ON public.resumes_normal (lower(candidate_key) text_pattern_ops);
+    """)
+
+def ensure_skill_counts_table(cur):
+    """
+    Creates `skill_counts`, the per-skill number of resumes_normal entries, and the
+    triggers that keep it in step with resumes_normal so the dashboard never has
+    to unnest the whole table.
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS public.skill_counts (
+        skill TEXT   PRIMARY KEY,
+        cnt   BIGINT NOT NULL DEFAULT 0
+    );
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_skill_counts_cnt
+    ON public.skill_counts (cnt DESC);
+    """)
+    cur.execute("""
+    CREATE OR REPLACE FUNCTION public.resumes_normal_skill_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            DELETE FROM public.skill_counts;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.skills_categories IS NOT NULL THEN
+            UPDATE public.skill_counts sc
+            SET cnt = sc.cnt - old_skills.n
+            FROM (
+                SELECT skill, COUNT(*) AS n
+                FROM unnest(OLD.skills_categories) AS skill
+                WHERE skill IS NOT NULL
+                GROUP BY skill
+            ) old_skills
+            WHERE sc.skill = old_skills.skill;
+
+            DELETE FROM public.skill_counts
+            WHERE skill = ANY(OLD.skills_categories) AND cnt <= 0;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.skills_categories IS NOT NULL THEN
+            INSERT INTO public.skill_counts (skill, cnt)
+            SELECT skill, COUNT(*)
+            FROM unnest(NEW.skills_categories) AS skill
+            WHERE skill IS NOT NULL
+            GROUP BY skill
+            ON CONFLICT (skill) DO UPDATE SET cnt = public.skill_counts.cnt + EXCLUDED.cnt;
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("""
+    DROP TRIGGER IF EXISTS trg_resumes_normal_skill_counts ON public.resumes_normal;
+    CREATE TRIGGER trg_resumes_normal_skill_counts
+    AFTER INSERT OR DELETE ON public.resumes_normal
+    FOR EACH ROW EXECUTE FUNCTION public.resumes_normal_skill_counts();
+
+    DROP TRIGGER IF EXISTS trg_resumes_normal_skill_counts_update ON public.resumes_normal;
+    CREATE TRIGGER trg_resumes_normal_skill_counts_update
+    AFTER UPDATE OF skills_categories ON public.resumes_normal
+    FOR EACH ROW
+    WHEN (OLD.skills_categories IS DISTINCT FROM NEW.skills_categories)
+    EXECUTE FUNCTION public.resumes_normal_skill_counts();
+
+    DROP TRIGGER IF EXISTS trg_resumes_normal_skill_counts_truncate ON public.resumes_normal;
+    CREATE TRIGGER trg_resumes_normal_skill_counts_truncate
+    AFTER TRUNCATE ON public.resumes_normal
+    FOR EACH STATEMENT EXECUTE FUNCTION public.resumes_normal_skill_counts();
+    """)
+    # Backfill rows written before the triggers existed
+    cur.execute("""
+    INSERT INTO public.skill_counts (skill, cnt)
+    SELECT skill, COUNT(*)
+    FROM public.resumes_normal, unnest(skills_categories) AS skill
+    WHERE skill IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM public.skill_counts)
+    GROUP BY skill;
+    """)
+
+def ensure_stats_counters_table(cur):
+    """
+    Creates `stats_counters`, the row counts of resumes_metadata and resumes_normal
+    plus the number of distinct metadata candidate keys, and the triggers that keep
+    them current so the overview never has to COUNT(*) the resume tables.
+    Distinct keys are tracked through `candidate_key_counts`, the per-key number of
+    resumes_metadata rows; a key is counted when it goes from 0 to 1 rows and
+    dropped when it goes back to 0.
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS public.stats_counters (
+        name TEXT   PRIMARY KEY,
+        cnt  BIGINT NOT NULL DEFAULT 0
+    );
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS public.candidate_key_counts (
+        candidate_key TEXT   PRIMARY KEY,
+        cnt           BIGINT NOT NULL DEFAULT 0
+    );
+    """)
+    cur.execute("""
+    CREATE OR REPLACE FUNCTION public.resumes_stats_counters() RETURNS trigger AS $$
+    DECLARE
+        key_cnt BIGINT;
+    BEGIN
+        IF TG_OP = 'TRUNCATE' THEN
+            UPDATE public.stats_counters SET cnt = 0 WHERE name = TG_TABLE_NAME;
+            IF TG_TABLE_NAME = 'resumes_metadata' THEN
+                DELETE FROM public.candidate_key_counts;
+                UPDATE public.stats_counters SET cnt = 0 WHERE name = 'unique_candidates';
+            END IF;
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP = 'INSERT' THEN
+            UPDATE public.stats_counters SET cnt = cnt + 1 WHERE name = TG_TABLE_NAME;
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE public.stats_counters SET cnt = cnt - 1 WHERE name = TG_TABLE_NAME;
+        END IF;
+
+        IF TG_TABLE_NAME <> 'resumes_metadata' THEN
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.candidate_key IS NOT NULL THEN
+            UPDATE public.candidate_key_counts
+            SET cnt = cnt - 1
+            WHERE candidate_key = OLD.candidate_key
+            RETURNING cnt INTO key_cnt;
+
+            IF key_cnt <= 0 THEN
+                DELETE FROM public.candidate_key_counts WHERE candidate_key = OLD.candidate_key;
+                UPDATE public.stats_counters SET cnt = cnt - 1 WHERE name = 'unique_candidates';
+            END IF;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.candidate_key IS NOT NULL THEN
+            INSERT INTO public.candidate_key_counts (candidate_key, cnt)
+            VALUES (NEW.candidate_key, 1)
+            ON CONFLICT (candidate_key) DO UPDATE SET cnt = public.candidate_key_counts.cnt + 1
+            RETURNING cnt INTO key_cnt;
+
+            IF key_cnt = 1 THEN
+                UPDATE public.stats_counters SET cnt = cnt + 1 WHERE name = 'unique_candidates';
+            END IF;
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("""
+    DROP TRIGGER IF EXISTS trg_resumes_metadata_stats_counters ON public.resumes_metadata;
+    CREATE TRIGGER trg_resumes_metadata_stats_counters
+    AFTER INSERT OR DELETE ON public.resumes_metadata
+    FOR EACH ROW EXECUTE FUNCTION public.resumes_stats_counters();
+
+    DROP TRIGGER IF EXISTS trg_resumes_metadata_stats_counters_update ON public.resumes_metadata;
+    CREATE TRIGGER trg_resumes_metadata_stats_counters_update
+    AFTER UPDATE OF candidate_key ON public.resumes_metadata
+    FOR EACH ROW
+    WHEN (OLD.candidate_key IS DISTINCT FROM NEW.candidate_key)
+    EXECUTE FUNCTION public.resumes_stats_counters();
+
+    DROP TRIGGER IF EXISTS trg_resumes_metadata_stats_counters_truncate ON public.resumes_metadata;
+    CREATE TRIGGER trg_resumes_metadata_stats_counters_truncate
+    AFTER TRUNCATE ON public.resumes_metadata
+    FOR EACH STATEMENT EXECUTE FUNCTION public.resumes_stats_counters();
+
+    DROP TRIGGER IF EXISTS trg_resumes_normal_stats_counters ON public.resumes_normal;
+    CREATE TRIGGER trg_resumes_normal_stats_counters
+    AFTER INSERT OR DELETE ON public.resumes_normal
+    FOR EACH ROW EXECUTE FUNCTION public.resumes_stats_counters();
+
+    DROP TRIGGER IF EXISTS trg_resumes_normal_stats_counters_truncate ON public.resumes_normal;
+    CREATE TRIGGER trg_resumes_normal_stats_counters_truncate
+    AFTER TRUNCATE ON public.resumes_normal
+    FOR EACH STATEMENT EXECUTE FUNCTION public.resumes_stats_counters();
+    """)
+    # Backfill rows written before the triggers existed
+    cur.execute("SELECT 1 FROM public.stats_counters LIMIT 1;")
+    if cur.fetchone() is None:
+        cur.execute("""
+        INSERT INTO public.candidate_key_counts (candidate_key, cnt)
+        SELECT candidate_key, COUNT(*)
+        FROM public.resumes_metadata
+        WHERE candidate_key IS NOT NULL
+        GROUP BY candidate_key
+        ON CONFLICT (candidate_key) DO NOTHING;
+        """)
+        cur.execute("""
+        INSERT INTO public.stats_counters (name, cnt) VALUES
+            ('resumes_metadata', (SELECT COUNT(*) FROM public.resumes_metadata)),
+            ('resumes_normal', (SELECT COUNT(*) FROM public.resumes_normal)),
+            ('unique_candidates', (SELECT COUNT(*) FROM public.candidate_key_counts))
+        ON CONFLICT (name) DO NOTHING;
+        """)
 
 def upsert_resumes_normal(
     cur,
@@ -833,6 +1165,79 @@ Best regards,
         """, (template['name'], template['subject'], template['body'], template['type']))
 
 
+def ensure_overview_view(cur):
+    """
+    Create the `resumes_overview_mv` materialized view holding every dashboard
+    statistic in one row. The resume tables only change through ingestion and
+    deletion, which refresh it via refresh_overview_view().
+    The view is rebuilt when its stored version differs from OVERVIEW_VIEW_VERSION.
+    """
+    cur.execute("SELECT obj_description(to_regclass('public.resumes_overview_mv'), 'pg_class');")
+    if cur.fetchone()[0] == str(OVERVIEW_VIEW_VERSION):
+        return
+
+    cur.execute("DROP MATERIALIZED VIEW IF EXISTS public.resumes_overview_mv;")
+    cur.execute("""
+        CREATE MATERIALIZED VIEW public.resumes_overview_mv AS
+        WITH top_skills AS (
+            SELECT skill, cnt as count
+            FROM public.skill_counts 
+            ORDER BY cnt DESC 
+            LIMIT 10
+        ),
+        top_universities AS (
+            SELECT university, COUNT(*) as count
+            FROM public.resumes_metadata 
+            WHERE university IS NOT NULL 
+            GROUP BY university 
+            ORDER BY count DESC 
+            LIMIT 5
+        ),
+        employment_distribution AS (
+            SELECT part_or_full, COUNT(*) as count
+            FROM public.resumes_metadata 
+            WHERE part_or_full IS NOT NULL 
+            GROUP BY part_or_full
+        ),
+        citizenship_distribution AS (
+            SELECT citizenship, COUNT(*) as count
+            FROM public.resumes_metadata 
+            WHERE citizenship IS NOT NULL 
+            GROUP BY citizenship
+        ),
+        salary_distribution AS (
+            SELECT salary_bucket as salary_range, COUNT(*) as count
+            FROM public.resumes_metadata 
+            WHERE salary_bucket IS NOT NULL 
+            GROUP BY salary_bucket
+        )
+        SELECT
+            1 AS id,
+            -- Trigger-maintained counters; see ensure_stats_counters_table()
+            COALESCE((SELECT cnt FROM public.stats_counters WHERE name = 'resumes_metadata'), 0) AS total_metadata,
+            COALESCE((SELECT cnt FROM public.stats_counters WHERE name = 'resumes_normal'), 0) AS total_normal,
+            COALESCE((SELECT cnt FROM public.stats_counters WHERE name = 'unique_candidates'), 0) AS unique_candidates,
+            (SELECT COALESCE(jsonb_agg(jsonb_build_array(skill, count) ORDER BY count DESC), '[]') FROM top_skills) AS top_skills,
+            (SELECT COALESCE(jsonb_agg(jsonb_build_array(university, count) ORDER BY count DESC), '[]') FROM top_universities) AS top_universities,
+            (SELECT COALESCE(jsonb_agg(jsonb_build_array(part_or_full, count) ORDER BY count DESC), '[]') FROM employment_distribution) AS employment_distribution,
+            (SELECT COALESCE(jsonb_agg(jsonb_build_array(citizenship, count) ORDER BY count DESC), '[]') FROM citizenship_distribution) AS citizenship_distribution,
+            (SELECT COALESCE(jsonb_agg(jsonb_build_array(salary_range, count) ORDER BY count DESC), '[]') FROM salary_distribution) AS salary_distribution;
+    """)
+    # REFRESH ... CONCURRENTLY needs a unique index
+    cur.execute("""
+        CREATE UNIQUE INDEX idx_resumes_overview_mv_id
+        ON public.resumes_overview_mv (id);
+    """)
+    cur.execute(f"COMMENT ON MATERIALIZED VIEW public.resumes_overview_mv IS '{OVERVIEW_VIEW_VERSION}';")
+
+def refresh_overview_view(env: Optional[Dict[str,str]] = None):
+    """Recompute the dashboard statistics after the resume tables change."""
+    with pooled_connection(env) as conn:
+        with conn.cursor() as cur:
+            # CONCURRENTLY keeps the view readable while it is rebuilt
+            cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY public.resumes_overview_mv;")
+
+
 def initialize_database():
     """Initialize all required database tables"""
     env = load_env_vars()
@@ -840,8 +1245,12 @@ def initialize_database():
     cur = conn.cursor()
     
     ensure_resumes_table(cur)
+    migrate_resumes_table(cur)
     ensure_resumes_normal_table(cur)
+    ensure_skill_counts_table(cur)
+    ensure_stats_counters_table(cur)
     ensure_email_templates_table(cur)  # Add this line
+    ensure_overview_view(cur)
     
     conn.commit()
     cur.close()
@@ -125,7 +125,7 @@ from .ingest_pg import ingest_all_resumes
 from .ingest_normal import ingest_resume_normal  
 
 # ADD THESE IMPORTS
-from .helpers import load_env_vars, connect_postgres
+from .helpers import load_env_vars, pooled_connection, refresh_overview_view
 from ..backend.progress_tracker import ProgressTracker
 
 def process_candidate(root_folder: str, person: str) -> List[str]:
@@ -212,8 +212,7 @@ def ingest_all_candidates_with_progress(
     # Initialize session ONCE at the start
     try:
         env = load_env_vars()
-        init_conn = connect_postgres(env)
-        init_tracker = ProgressTracker(init_conn)
+        init_tracker = ProgressTracker(env)
         
         metadata = {
             "source": "batch_ingestion",
@@ -223,8 +222,6 @@ def ingest_all_candidates_with_progress(
         init_tracker.start_ingestion(session_id, total, metadata)
         print(f"✅ Started tracking session {session_id}")
         
-        init_conn.close()  # Close immediately after initialization
-        
     except Exception as e:
         print(f"⚠️ Failed to initialize progress tracking: {e}")
 
@@ -235,11 +232,10 @@ def ingest_all_candidates_with_progress(
     def enhanced_progress_callback(idx: int, total: int, filename: str):
         print(f"📊 Progress callback: {idx}/{total} - {filename}")
         
-        # Create FRESH database connection for each update
+        # Tracker borrows a pooled connection for each update
         try:
             env = load_env_vars()
-            fresh_conn = connect_postgres(env)
-            fresh_tracker = ProgressTracker(fresh_conn)
+            fresh_tracker = ProgressTracker(env)
             
             fresh_tracker.update_progress(
                 session_id, 
@@ -248,7 +244,6 @@ def ingest_all_candidates_with_progress(
                 None
             )
             
-            fresh_conn.close()  # Always close after use
             print(f"✅ Database updated: {idx}/{total}")
             
         except Exception as e:
@@ -281,13 +276,11 @@ def ingest_all_candidates_with_progress(
                     print(f"❌ {error_msg}")
                     summary_logs.append(f"❌ {error_msg}")
                     
-                    # Update database with error using fresh connection
+                    # Update database with error (pooled connection)
                     try:
                         env = load_env_vars()
-                        error_conn = connect_postgres(env)
-                        error_tracker = ProgressTracker(error_conn)
+                        error_tracker = ProgressTracker(env)
                         error_tracker.update_progress(session_id, completed + 1, person, error_msg)
-                        error_conn.close()
                     except Exception as db_err:
                         print(f"⚠️ Failed to log error to database: {db_err}")
                     
@@ -297,13 +290,18 @@ def ingest_all_candidates_with_progress(
                 completed += 1
                 enhanced_progress_callback(completed, total, person)
 
-        # Mark session as completed using fresh connection
+        # Dashboard statistics are precomputed; fold in the new resumes before
+        # the final status is published, since the UI clears its caches on it
+        try:
+            refresh_overview_view()
+        except Exception as e:
+            print(f"⚠️ Failed to refresh overview view: {e}")
+        
+        # Mark session as completed
         try:
             env = load_env_vars()
-            final_conn = connect_postgres(env)
-            final_tracker = ProgressTracker(final_conn)
+            final_tracker = ProgressTracker(env)
             final_tracker.finish_ingestion(session_id, "COMPLETED")
-            final_conn.close()
             print(f"✅ Session {session_id} marked as COMPLETED")
         except Exception as e:
             print(f"⚠️ Failed to mark session as completed: {e}")
@@ -311,13 +309,17 @@ def ingest_all_candidates_with_progress(
         return summary_logs, session_id
 
     except Exception as e:
-        # Mark session as failed using fresh connection
+        # Candidates committed before the failure still belong on the dashboard
+        try:
+            refresh_overview_view()
+        except Exception as refresh_err:
+            print(f"⚠️ Failed to refresh overview view: {refresh_err}")
+        
+        # Mark session as failed
         try:
             env = load_env_vars()
-            fail_conn = connect_postgres(env)
-            fail_tracker = ProgressTracker(fail_conn)
+            fail_tracker = ProgressTracker(env)
             fail_tracker.finish_ingestion(session_id, "FAILED")
-            fail_conn.close()
             print(f"❌ Session {session_id} marked as FAILED")
         except:
             pass
@@ -370,17 +372,14 @@ def ingest_all_candidates_with_progress_stoppable(
     def cleanup_partial_candidate(candidate_key: str):
         """Remove partial data for a candidate"""
         try:
-            env = load_env_vars()
-            conn = connect_postgres(env)
-            cur = conn.cursor()
-            
-            # Remove from both tables
-            cur.execute("DELETE FROM resumes_metadata WHERE candidate_key = %s", (candidate_key,))
-            cur.execute("DELETE FROM resumes_normal WHERE candidate_key = %s", (candidate_key,))
-            
-            conn.commit()
-            cur.close()
-            conn.close()
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+
+                # Remove from both tables
+                cur.execute("DELETE FROM resumes_metadata WHERE candidate_key = %s", (candidate_key,))
+                cur.execute("DELETE FROM resumes_normal WHERE candidate_key = %s", (candidate_key,))
+
+                cur.close()
             
             print(f"🧹 Cleaned up partial data for {candidate_key}")
         except Exception as e:
@@ -405,8 +404,7 @@ def ingest_all_candidates_with_progress_stoppable(
     # Initialize session ONCE at the start
     try:
         env = load_env_vars()
-        init_conn = connect_postgres(env)
-        init_tracker = ProgressTracker(init_conn)
+        init_tracker = ProgressTracker(env)
         
         metadata = {
             "source": "batch_ingestion_stoppable",
@@ -416,8 +414,6 @@ def ingest_all_candidates_with_progress_stoppable(
         init_tracker.start_ingestion(session_id, total, metadata)
         print(f"✅ Started tracking session {session_id}")
         
-        init_conn.close()
-        
     except Exception as e:
         print(f"⚠️ Failed to initialize progress tracking: {e}")
 
@@ -431,8 +427,7 @@ def ingest_all_candidates_with_progress_stoppable(
         # Update database progress
         try:
             env = load_env_vars()
-            fresh_conn = connect_postgres(env)
-            fresh_tracker = ProgressTracker(fresh_conn)
+            fresh_tracker = ProgressTracker(env)
             
             # Check if we should stop before updating
             if stop_check_callback and stop_check_callback():
@@ -440,7 +435,6 @@ def ingest_all_candidates_with_progress_stoppable(
             else:
                 fresh_tracker.update_progress(session_id, idx, f"Completed {filename}", None)
             
-            fresh_conn.close()
             print(f"✅ Database updated: {idx}/{total}")
             
         except Exception as e:
@@ -476,10 +470,10 @@ def ingest_all_candidates_with_progress_stoppable(
                         if not remaining_future.done():
                             remaining_future.cancel()
             
-                    print(f"🛑 Graceful stop completed - status remains ARCHIVED")
+                    print(f"🛑 Graceful stop completed - session will be marked STOPPED")
                     
                     summary_logs.append(f"🛑 Ingestion stopped gracefully after {completed}/{total} candidates")
-                    return summary_logs, session_id
+                    break
                 
                 # Process completed future
                 person = future_to_candidate[future]
@@ -500,13 +494,11 @@ def ingest_all_candidates_with_progress_stoppable(
                     print(f"❌ {error_msg}")
                     summary_logs.append(f"❌ {error_msg}")
                     
-                    # Update database with error using fresh connection
+                    # Update database with error (pooled connection)
                     try:
                         env = load_env_vars()
-                        error_conn = connect_postgres(env)
-                        error_tracker = ProgressTracker(error_conn)
+                        error_tracker = ProgressTracker(env)
                         error_tracker.update_progress(session_id, completed + 1, person, error_msg)
-                        error_conn.close()
                     except Exception as db_err:
                         print(f"⚠️ Failed to log error to database: {db_err}")
                     
@@ -516,28 +508,37 @@ def ingest_all_candidates_with_progress_stoppable(
                 completed += 1
                 enhanced_progress_callback(completed, total, person)
 
-        # Mark session as completed (if not stopped)
-        if not (stop_check_callback and stop_check_callback()):
-            try:
-                env = load_env_vars()
-                final_conn = connect_postgres(env)
-                final_tracker = ProgressTracker(final_conn)
-                final_tracker.finish_ingestion(session_id, "COMPLETED")
-                final_conn.close()
-                print(f"✅ Session {session_id} marked as COMPLETED")
-            except Exception as e:
-                print(f"⚠️ Failed to mark session as completed: {e}")
+        # Dashboard statistics are precomputed; fold in the new resumes before
+        # the final status is published, since the UI clears its caches on it
+        try:
+            refresh_overview_view()
+        except Exception as e:
+            print(f"⚠️ Failed to refresh overview view: {e}")
+        
+        # Mark session as completed, or as stopped once the in-flight candidates finished
+        final_status = "STOPPED" if stop_check_callback and stop_check_callback() else "COMPLETED"
+        try:
+            env = load_env_vars()
+            final_tracker = ProgressTracker(env)
+            final_tracker.finish_ingestion(session_id, final_status)
+            print(f"✅ Session {session_id} marked as {final_status}")
+        except Exception as e:
+            print(f"⚠️ Failed to mark session as {final_status.lower()}: {e}")
         
         return summary_logs, session_id
 
     except Exception as e:
+        # Candidates committed before the failure still belong on the dashboard
+        try:
+            refresh_overview_view()
+        except Exception as refresh_err:
+            print(f"⚠️ Failed to refresh overview view: {refresh_err}")
+        
         # Mark session as failed
         try:
             env = load_env_vars()
-            fail_conn = connect_postgres(env)
-            fail_tracker = ProgressTracker(fail_conn)
+            fail_tracker = ProgressTracker(env)
             fail_tracker.finish_ingestion(session_id, "FAILED")
-            fail_conn.close()
             print(f"❌ Session {session_id} marked as FAILED")
         except:
             pass
@@ -101,12 +101,12 @@ import os
 import sys
 import time
 import traceback
-import json
+from psycopg2.extras import Json
 from datetime import datetime
 from typing import Optional, List
 
 from .ingest_all import ingest_all_candidates_with_progress_stoppable  # CHANGED: Use stoppable version
-from .helpers import load_env_vars, connect_postgres
+from .helpers import pooled_connection
 
 def run_ingestion_worker(root_folder: str, session_id: str, max_workers: int = 4) -> None:
     """
@@ -136,20 +136,18 @@ def run_ingestion_worker(root_folder: str, session_id: str, max_workers: int = 4
     def check_should_stop():
         """Check if we should stop based on database status"""
         try:
-            env = load_env_vars()
-            conn = connect_postgres(env)
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT status FROM ingestion_progress 
-                WHERE session_id = %s
-            """, (session_id,))
-            
-            result = cur.fetchone()
-            cur.close()
-            conn.close()
+            with pooled_connection() as conn:
+                cur = conn.cursor()
+
+                cur.execute("""
+                    SELECT status FROM ingestion_progress 
+                    WHERE session_id = %s
+                """, (session_id,))
+
+                result = cur.fetchone()
+                cur.close()
             
-            if result and result[0] in ['ABANDONED', 'ARCHIVED']:
+            if result and result[0] in ['ABANDONED', 'ARCHIVED', 'STOPPED']:
                 log_to_file(f"🛑 Stop signal detected: status = {result[0]}")
                 return True
             return False
@@ -189,35 +187,32 @@ def run_ingestion_worker(root_folder: str, session_id: str, max_workers: int = 4
             log_to_file(log)
         
         # Store summary in database
-        env = load_env_vars()
-        conn = connect_postgres(env)
-        cur = conn.cursor()
-        
-        # Store both logs and log file path in database
-        cur.execute("""
-            UPDATE ingestion_progress 
-            SET metadata = jsonb_set(
-                COALESCE(metadata, '{}'::jsonb), 
-                '{summary_logs}', 
-                %s::jsonb
-            )
-            WHERE session_id = %s
-        """, (json.dumps(summary_logs), session_id))
-        
-        # Also store log file path
-        cur.execute("""
-            UPDATE ingestion_progress 
-            SET metadata = jsonb_set(
-                metadata, 
-                '{log_file_path}', 
-                %s::jsonb
-            )
-            WHERE session_id = %s
-        """, (json.dumps(log_file), session_id))
-        
-        conn.commit()
-        cur.close()
-        conn.close()
+        with pooled_connection() as conn:
+            cur = conn.cursor()
+
+            # Store both logs and log file path in database
+            cur.execute("""
+                UPDATE ingestion_progress 
+                SET metadata = jsonb_set(
+                    COALESCE(metadata, '{}'::jsonb), 
+                    '{summary_logs}', 
+                    %s::jsonb
+                )
+                WHERE session_id = %s
+            """, (Json(summary_logs), session_id))
+
+            # Also store log file path
+            cur.execute("""
+                UPDATE ingestion_progress 
+                SET metadata = jsonb_set(
+                    metadata, 
+                    '{log_file_path}', 
+                    %s::jsonb
+                )
+                WHERE session_id = %s
+            """, (Json(log_file), session_id))
+
+            cur.close()
         
         log_to_file(f"\n✅ Worker process completed for session {session_id}")
         log_to_file(f"📋 Processed {len(summary_logs)} items")